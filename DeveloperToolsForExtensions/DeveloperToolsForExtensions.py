@@ -1,8 +1,9 @@
 import os
-from __main__ import vtk, qt, ctk, slicer
+import vtk, qt, ctk, slicer
 from slicer.ScriptedLoadableModule import *
 import logging
 import sys
+import time
 
 if sys.version_info[0] == 3:
   basestring = str
@@ -44,6 +45,9 @@ class DeveloperToolsForExtensionsWidget(ScriptedLoadableModuleWidget):
         self.timeout = 3000
         self.extensionFileDialog = None
         self.moduleFileDialog = None
+        self.moduleDirectoryDialog = None
+        self.installProgressDialog = None
+        self.installJob = None
         icon = self.parent.style().standardIcon(qt.QStyle.SP_ArrowForward)
         iconSize = qt.QSize(22, 22)
         def createToolButton(text):
@@ -86,9 +90,90 @@ class DeveloperToolsForExtensionsWidget(ScriptedLoadableModuleWidget):
         self.moduleSelector.setToolTip("Select a module you want to load in Slicer")
         parametersFormLayout.addRow(self.moduleSelector)
 
+        # Select directory of script modules to load
+        self.moduleDirectorySelector = createToolButton("Load modules from directory")
+        self.moduleDirectorySelector.setToolTip("Select a directory: all script modules found in it\
+                                                 (and in its subdirectories) are loaded in Slicer")
+        parametersFormLayout.addRow(self.moduleDirectorySelector)
+
         # connections
         self.extensionSelector.connect('clicked(bool)', self.onExtensionSelect)
         self.moduleSelector.connect('clicked(bool)', self.onModuleSelect)
+        self.moduleDirectorySelector.connect('clicked(bool)', self.onModuleDirectorySelect)
+
+        #
+        # Module load profiling Area
+        #
+        profilingCollapsibleButton = ctk.ctkCollapsibleButton()
+        profilingCollapsibleButton.text = "Module load profiling"
+        profilingCollapsibleButton.collapsed = True
+        self.layout.addWidget(profilingCollapsibleButton)
+        profilingFormLayout = qt.QFormLayout(profilingCollapsibleButton)
+
+        self.profileModuleLoadCheckBox = qt.QCheckBox()
+        self.profileModuleLoadCheckBox.setToolTip("Measure the time spent registering, importing, instantiating\
+                                                   and setting up the widget of modules loaded with 'Load module'")
+        profilingFormLayout.addRow("Profile module loading:", self.profileModuleLoadCheckBox)
+
+        self.profileIsolatedImportCheckBox = qt.QCheckBox()
+        self.profileIsolatedImportCheckBox.setToolTip("Measure the import time of modules loaded with 'Load module'\
+                                                       in a separate Slicer process (it takes a few seconds per module)")
+        profilingFormLayout.addRow("Measure isolated import time:", self.profileIsolatedImportCheckBox)
+
+        self.profileCallsCheckBox = qt.QCheckBox()
+        self.profileCallsCheckBox.setToolTip("Collect Python call statistics (cProfile) while profiling")
+        profilingFormLayout.addRow("Collect call statistics:", self.profileCallsCheckBox)
+
+        self.profileInstalledModulesButton = qt.QPushButton("Profile installed modules")
+        self.profileInstalledModulesButton.setToolTip("Measure the isolated import and widget setup time of the\
+                                                       modules found in the additional module paths")
+        profilingFormLayout.addRow(self.profileInstalledModulesButton)
+
+        self.profileTableView = slicer.qMRMLTableView()
+        self.profileTableView.setMRMLScene(slicer.mrmlScene)
+        profilingFormLayout.addRow(self.profileTableView)
+        self.profileTableNode = None
+
+        self.profileCallStatsText = qt.QPlainTextEdit()
+        self.profileCallStatsText.readOnly = True
+        self.profileCallStatsText.visible = False
+        profilingFormLayout.addRow(self.profileCallStatsText)
+
+        self.profileInstalledModulesButton.connect('clicked(bool)', self.onProfileInstalledModules)
+
+        #
+        # Module search paths Area
+        #
+        searchPathsCollapsibleButton = ctk.ctkCollapsibleButton()
+        searchPathsCollapsibleButton.text = "Module search paths"
+        searchPathsCollapsibleButton.collapsed = True
+        self.layout.addWidget(searchPathsCollapsibleButton)
+        searchPathsFormLayout = qt.QFormLayout(searchPathsCollapsibleButton)
+
+        self.measureSearchPathsButton = qt.QPushButton("Measure module search paths")
+        self.measureSearchPathsButton.setToolTip("Measure the number of files and the time it takes to scan\
+                                                  each permanent module search path at startup")
+        searchPathsFormLayout.addRow(self.measureSearchPathsButton)
+
+        self.cleanSearchPathsButton = qt.QPushButton("Remove duplicate and missing paths")
+        self.cleanSearchPathsButton.setToolTip("Remove duplicate and non-existent entries from\
+                                                the permanent module search paths")
+        searchPathsFormLayout.addRow(self.cleanSearchPathsButton)
+
+        self.removeSearchPathButton = qt.QPushButton("Remove selected path")
+        self.removeSearchPathButton.setToolTip("Remove the path selected in the table from\
+                                                the permanent module search paths")
+        searchPathsFormLayout.addRow(self.removeSearchPathButton)
+
+        self.searchPathsTableView = slicer.qMRMLTableView()
+        self.searchPathsTableView.setMRMLScene(slicer.mrmlScene)
+        self.searchPathsTableView.setSelectionBehavior(qt.QAbstractItemView.SelectRows)
+        searchPathsFormLayout.addRow(self.searchPathsTableView)
+        self.searchPathsTableNode = None
+
+        self.measureSearchPathsButton.connect('clicked(bool)', self.updateSearchPathsReport)
+        self.cleanSearchPathsButton.connect('clicked(bool)', self.onCleanSearchPaths)
+        self.removeSearchPathButton.connect('clicked(bool)', self.onRemoveSearchPath)
 
         # Add vertical spacer
         self.layout.addStretch(1)
@@ -97,7 +182,9 @@ class DeveloperToolsForExtensionsWidget(ScriptedLoadableModuleWidget):
         self.logic = DeveloperToolsForExtensionsLogic()
 
     def cleanup(self):
-        pass
+        if self.installJob:
+            self.installJob.abort()
+            self.installJob = None
 
     def customDialog(self, filter_name, okCaption, windowTitle ):
         dialog = qt.QFileDialog(self.parent)
@@ -116,18 +203,114 @@ class DeveloperToolsForExtensionsWidget(ScriptedLoadableModuleWidget):
 
     def onModuleFileSelected(self, fileName):
         self.moduleFileDialog.hide()
+        profile = self.profileModuleLoadCheckBox.checked
+        permanent = False
+        if not profile:
+            value = qt.QMessageBox.question(slicer.util.mainWindow(), "",
+                                          "Do you want to add module path to permanent search paths?",
+                                          qt.QMessageBox.Yes | qt.QMessageBox.No)
+            if value == qt.QMessageBox.Yes:
+                permanent = True
+        try:
+            self.logic.addModule(fileName, permanent, profile, self.profileCallsCheckBox.checked,
+                                 self.profileIsolatedImportCheckBox.checked)
+            slicer.util.delayDisplay("Module "+fileName+" loaded", self.timeout)
+        except Exception as e:
+            logging.critical(e)
+            slicer.util.errorDisplay(e, self.timeout)
+        if not profile or not self.logic.moduleLoadProfiles:
+            return
+        self.updateProfileReport()
+        # Module load cost is known now, ask if the module path should be made permanent
+        moduleProfile = self.logic.moduleLoadProfiles[-1]
+        if not slicer.app.moduleManager().factoryManager().isLoaded(moduleProfile['name']):
+            return
+        totalTime = sum(moduleProfile[phase] or 0.0 for phase in self.logic.moduleLoadPhases)
+        value = qt.QMessageBox.question(slicer.util.mainWindow(), "",
+                                      "Module %s took %.0f ms to load. Do you want to add module path\
+                                      to permanent search paths?" % (moduleProfile['name'], totalTime * 1000.0),
+                                      qt.QMessageBox.Yes | qt.QMessageBox.No)
+        if value == qt.QMessageBox.Yes:
+            self.logic.addModuleSearchPaths([os.path.dirname(fileName)])
+
+    def onProfileInstalledModules(self):
+        with slicer.util.tryWithErrorDisplay("Failed to profile installed modules.", waitCursor=True):
+            self.logic.profileInstalledModules(self.profileCallsCheckBox.checked)
+        self.updateProfileReport()
+
+    def updateSearchPathsReport(self):
+        if not self.searchPathsTableNode:
+            self.searchPathsTableNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLTableNode", "ModuleSearchPaths")
+            self.searchPathsTableNode.SetUseColumnTitleAsColumnHeader(True)
+            self.searchPathsTableView.setMRMLTableNode(self.searchPathsTableNode)
+        with slicer.util.tryWithErrorDisplay("Failed to measure module search paths.", waitCursor=True):
+            self.logic.getModuleSearchPathsAsTable(self.searchPathsTableNode)
+
+    def onCleanSearchPaths(self):
+        removedPaths = self.logic.cleanModuleSearchPaths()
+        slicer.util.infoDisplay("Removed %d duplicate and %d missing module search paths.\
+                                 Changes take effect after restarting Slicer."
+                                % (len(removedPaths['duplicate']), len(removedPaths['missing'])),
+                                windowTitle="Module search paths")
+        self.updateSearchPathsReport()
+
+    def onRemoveSearchPath(self):
+        if not self.searchPathsTableNode:
+            return
+        # Selected rows are rows of the sort proxy model, map them to table rows
+        proxyModel = self.searchPathsTableView.sortFilterProxyModel()
+        tableModel = self.searchPathsTableView.tableModel()
+        rows = set(tableModel.mrmlTableRowIndex(proxyModel.mapToSource(index))
+                   for index in self.searchPathsTableView.selectionModel().selectedRows())
+        paths = [self.searchPathsTableNode.GetCellText(row, 0) for row in rows]
+        if not paths:
+            return
+        self.logic.removeModuleSearchPaths(paths)
+        self.updateSearchPathsReport()
+
+    def updateProfileReport(self):
+        if not self.profileTableNode:
+            self.profileTableNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLTableNode", "ModuleLoadProfile")
+            self.profileTableNode.SetUseColumnTitleAsColumnHeader(True)
+            self.profileTableView.setMRMLTableNode(self.profileTableNode)
+        self.logic.getModuleLoadProfilesAsTable(self.profileTableNode)
+        callStats = ["%s: isolated import failed: %s" % (moduleProfile['name'], moduleProfile['isolatedImportError'])
+                     for moduleProfile in self.logic.moduleLoadProfiles if moduleProfile['isolatedImportError']]
+        callStats += ["%s:\n%s" % (moduleProfile['name'], moduleProfile['callStats'])
+                      for moduleProfile in self.logic.moduleLoadProfiles if moduleProfile['callStats']]
+        self.profileCallStatsText.plainText = "\n".join(callStats)
+        self.profileCallStatsText.visible = bool(callStats)
+
+    def onModuleDirectorySelect(self):
+        if not self.moduleDirectoryDialog:
+            self.moduleDirectoryDialog = self.customDialog("Directory", "Load", "Select directory of modules to load")
+            self.moduleDirectoryDialog.fileMode = qt.QFileDialog.Directory
+            self.moduleDirectoryDialog.setOption(qt.QFileDialog.ShowDirsOnly)
+            self.moduleDirectoryDialog.connect("fileSelected(QString)", self.onModuleDirectorySelected)
+        self.moduleDirectoryDialog.show()
+
+    def onModuleDirectorySelected(self, directory):
+        self.moduleDirectoryDialog.hide()
         value = qt.QMessageBox.question(slicer.util.mainWindow(), "",
-                                      "Do you want to add module path to permanent search paths?",
+                                      "Do you want to add module paths to permanent search paths?",
                                       qt.QMessageBox.Yes | qt.QMessageBox.No)
         permanent = False
         if value == qt.QMessageBox.Yes:
             permanent = True
         try:
-            self.logic.addModule(fileName,permanent)
-            slicer.util.delayDisplay("Module "+fileName+" loaded", self.timeout)
+            result = self.logic.addModulesFromDirectory(directory, permanent)
         except Exception as e:
             logging.critical(e)
             slicer.util.errorDisplay(e, self.timeout)
+            return
+        report = ["%s: %s (registered in %.3fs)" % (module['name'], "loaded", module['registerTime'])
+                  if module['loaded'] else "%s: FAILED (%s)" % (module['name'], module['error'])
+                  for module in result['modules']]
+        report.append("Modules loaded in %.3fs" % result['loadTime'])
+        if all(module['loaded'] for module in result['modules']):
+            slicer.util.infoDisplay("\n".join(report), windowTitle="Load modules")
+        else:
+            slicer.util.errorDisplay("\n".join(report), windowTitle="Load modules")
 
     def onExtensionSelect(self):
         if not self.extensionFileDialog:
@@ -138,15 +321,39 @@ class DeveloperToolsForExtensionsWidget(ScriptedLoadableModuleWidget):
 
     def onExtensionFileSelected(self, fileName):
         self.extensionFileDialog.hide()
-        try:
-            self.logic.installExtension(fileName)
-            value=qt.QMessageBox.question(slicer.util.mainWindow(), "",
-                                          "Are you sure you want to restart?", qt.QMessageBox.Ok | qt.QMessageBox.No)
-            # http://qt-project.org/doc/qt-4.8/qmessagebox.html#StandardButton-enum
-            if value == qt.QMessageBox.Ok:
-                slicer.util.restart()
-        except Exception as e:
-            slicer.util.errorDisplay(e, self.timeout)
+        self.extensionSelector.enabled = False
+        self.installProgressDialog = qt.QProgressDialog("Installing extension...", "Cancel", 0, 100,
+                                                        slicer.util.mainWindow())
+        self.installProgressDialog.windowTitle = "Install extension"
+        self.installProgressDialog.windowModality = qt.Qt.WindowModal
+        self.installProgressDialog.minimumDuration = 0
+        self.installProgressDialog.show()
+        job = self.logic.installExtensionAsync(fileName, self.onExtensionInstallProgress,
+                                               self.onExtensionInstallFinished)
+        if job.isRunning():
+            self.installJob = job
+            self.installProgressDialog.connect('canceled()', job.cancel)
+
+    def onExtensionInstallProgress(self, stage, progress):
+        stageLabels = {'validate': "Validating extension archive...", 'hash': "Computing archive hash...",
+                       'verify': "Verifying extension archive...",
+                       'register': "Extracting and registering extension (Slicer does not respond until it completes)..."}
+        self.installProgressDialog.labelText = stageLabels[stage]
+        self.installProgressDialog.value = int(progress * 100)
+
+    def onExtensionInstallFinished(self, success, message):
+        self.installProgressDialog.hide()
+        self.installProgressDialog = None
+        self.installJob = None
+        self.extensionSelector.enabled = True
+        if not success:
+            slicer.util.errorDisplay(message, self.timeout)
+            return
+        value=qt.QMessageBox.question(slicer.util.mainWindow(), "",
+                                      "Are you sure you want to restart?", qt.QMessageBox.Ok | qt.QMessageBox.No)
+        # http://qt-project.org/doc/qt-4.8/qmessagebox.html#StandardButton-enum
+        if value == qt.QMessageBox.Ok:
+            slicer.util.restart()
 #
 # DeveloperToolsForExtensionsLogic
 #
@@ -161,6 +368,17 @@ class DeveloperToolsForExtensionsLogic(ScriptedLoadableModuleLogic):
     Uses ScriptedLoadableModuleLogic base class, available at:
     https://github.com/Slicer/Slicer/blob/master/Base/Python/slicer/ScriptedLoadableModule.py
     """
+
+    # Module loading phases measured by the module load profiler.
+    # 'instantiate' is the factory loading the module: it imports the module source and instantiates the module.
+    moduleLoadPhases = ['register', 'instantiate', 'widgetSetup']
+
+    def __init__(self):
+        ScriptedLoadableModuleLogic.__init__(self)
+        self.moduleLoadProfiles = []
+        # Parsed extension description files, indexed by file name: (modification time, size, description)
+        self.extensionDescriptionCache = {}
+
     def PlatformCheck(self, filename):
         """Compare extension platform with current platform.
         """
@@ -187,6 +405,25 @@ class DeveloperToolsForExtensionsLogic(ScriptedLoadableModuleLogic):
         directory, filename = os.path.split(filename)
         return filename in os.listdir(directory)
 
+    def validateExtensionArchive(self, filename):
+        """
+        Checks that an extension archive exists, matches the current platform and contains
+        an extension description. Returns the extension name and description.
+        """
+        if not self.CheckFileExistsCaseSensitive(filename):
+            raise Exception('Extension file does not exist: %s' % filename)
+        try:
+            self.PlatformCheck(filename)
+        except Exception as e:
+            raise Exception('Extension file for wrong platform: %s' % e)
+        try:
+            extensionName, description = self.readExtensionArchiveDescription(filename)
+        except Exception as e:
+            raise Exception('Extension file cannot be read: %s' % e)
+        if extensionName is None:
+            raise Exception('Extension file does not contain an extension description (.s4ext)')
+        return extensionName, description
+
     def installExtension(self, filename):
         """
         Install a given extension, from an archive, in Slicer
@@ -204,6 +441,392 @@ class DeveloperToolsForExtensionsLogic(ScriptedLoadableModuleLogic):
         logging.info('Extension installation process completed')
         return val
 
+    def _checkArchiveMemberName(self, name):
+        """
+        Raises an exception if an archive member would be extracted outside of the extension directory.
+        """
+        normalizedName = name.replace('\\', '/')
+        if normalizedName.startswith('/') or '..' in normalizedName.split('/') or ':' in normalizedName.split('/')[0]:
+            raise Exception('Extension file contains an invalid path: %s' % name)
+
+    def verifyExtensionArchive(self, filename, expectedSha256=None, progressCallback=None, cancelEvent=None):
+        """
+        Checks an extension archive before it is installed: its SHA256 hash (only if an expected hash
+        is given), that no member would be extracted outside of the extension directory and that it
+        contains an extension description. Member data is not decompressed (except for tar archives,
+        where the compressed stream has to be read to find the member headers).
+        Does not access the Slicer application, therefore it can be run on a worker thread.
+        :param progressCallback: called with stage name ('hash' or 'verify') and stage progress (0-1).
+        :param cancelEvent: threading.Event, processing is cancelled when it is set.
+        Returns the archive hash (None if no expected hash is given).
+        """
+        import tarfile
+        import zipfile
+        chunkSize = 1024 * 1024
+
+        def checkCancelled():
+            if cancelEvent is not None and cancelEvent.is_set():
+                raise Exception('Extension installation cancelled')
+
+        def reportProgress(stage, progress):
+            if progressCallback:
+                progressCallback(stage, progress)
+
+        totalSize = max(os.path.getsize(filename), 1)
+
+        # Hash
+        digest = None
+        if expectedSha256:
+            import hashlib
+            sha256 = hashlib.sha256()
+            with open(filename, 'rb') as f:
+                for chunk in iter(lambda: f.read(chunkSize), b''):
+                    checkCancelled()
+                    sha256.update(chunk)
+                    reportProgress('hash', f.tell() / totalSize)
+            digest = sha256.hexdigest()
+            logging.info('Extension archive %s SHA256: %s', filename, digest)
+            if digest != expectedSha256.lower():
+                raise Exception('Extension file hash mismatch: %s (expected %s)' % (digest, expectedSha256))
+
+        # Verify
+        hasDescription = False
+        if zipfile.is_zipfile(filename):
+            with zipfile.ZipFile(filename) as archive:
+                for info in archive.infolist():
+                    self._checkArchiveMemberName(info.filename)
+                    hasDescription = hasDescription or info.filename.endswith('.s4ext')
+            reportProgress('verify', 1.0)
+        else:
+            with open(filename, 'rb') as rawFile, tarfile.open(fileobj=rawFile, mode='r:*') as archive:
+                for member in archive:
+                    checkCancelled()
+                    self._checkArchiveMemberName(member.name)
+                    hasDescription = hasDescription or member.name.endswith('.s4ext')
+                    reportProgress('verify', min(rawFile.tell() / totalSize, 1.0))
+        if not hasDescription:
+            raise Exception('Extension file does not contain an extension description (.s4ext)')
+        return {'sha256': digest}
+
+    def installExtensionAsync(self, filename, progressCallback=None, finishedCallback=None, expectedSha256=None):
+        """
+        Installs an extension archive, the archive is verified (and hashed, if an expected hash is given)
+        on a worker thread.
+        Extraction and registration are done by the extensions manager model, on the main thread:
+        the application does not respond until they complete.
+        Returns the started installation job, which can be cancelled.
+        See DeveloperToolsForExtensionsInstallJob for the callback arguments.
+        """
+        job = DeveloperToolsForExtensionsInstallJob(self, filename, progressCallback, finishedCallback, expectedSha256)
+        job.start()
+        return job
+
+    def getSlicerVersionDirectory(self):
+        """
+        Returns the versioned directory name used in extension packages, of the form "Slicer-5.8".
+        """
+        versionNoDate = slicer.app.applicationVersion.split("-")  # Get version number without date
+        versionSplit = versionNoDate[0].split(".")  # Split major.minor.patch
+        return "Slicer-"+versionSplit[0]+"."+versionSplit[1]
+
+    def getExtensionArchiveLayout(self, extensionName):
+        """
+        Returns the archive root name (of the form Revision-OS-Arch-Name) and the directory,
+        inside the archive, where the extension install tree is stored for the current platform.
+        """
+        rootName = "-".join([slicer.app.repositoryRevision, slicer.app.os, slicer.app.arch, extensionName])
+        if slicer.app.os == "macosx":
+            installTreePath = "/".join([rootName, "Slicer.app", "Contents",
+                                        "Extensions-"+slicer.app.repositoryRevision, extensionName])
+        else:  # "win" or linux
+            installTreePath = rootName
+        return rootName, installTreePath
+
+    def _listPackageMembers(self, inputDirectory, installTreePath):
+        """
+        Returns the sorted list of (archive name, file name) of the files, directories and symbolic links
+        of an extension install tree. Archive names of directories end with "/".
+        """
+        members = []
+        prefixParts = installTreePath.split("/")
+        for index in range(len(prefixParts)):
+            members.append(("/".join(prefixParts[:index+1]) + "/", None))
+        for dirPath, dirNames, fileNames in os.walk(inputDirectory):
+            relativeDirPath = os.path.relpath(dirPath, inputDirectory)
+            archiveDirPath = installTreePath if relativeDirPath == "." else \
+                "/".join([installTreePath] + relativeDirPath.split(os.sep))
+            for dirName in list(dirNames):
+                fileName = os.path.join(dirPath, dirName)
+                if os.path.islink(fileName):
+                    # Not followed by os.walk, stored as a link
+                    dirNames.remove(dirName)
+                    members.append((archiveDirPath + "/" + dirName, fileName))
+                else:
+                    members.append((archiveDirPath + "/" + dirName + "/", fileName))
+            for fileName in fileNames:
+                members.append((archiveDirPath + "/" + fileName, os.path.join(dirPath, fileName)))
+        members.sort()
+        return members
+
+    def _compressPackageMember(self, fileName, compressionLevel, chunkSize=1024 * 1024,
+                               maxMemorySize=16 * 1024 * 1024):
+        """
+        Reads and compresses an archive member in chunks. Runs on packager worker threads (zlib releases the GIL).
+        Compressed data is kept in memory up to maxMemorySize, larger compressed data is spooled to a temporary file.
+        Returns (compression method, CRC32, uncompressed size, compressed size, data, file mode), where data is
+        bytes, a file object positioned at the start of the compressed data, or None if the file is stored
+        uncompressed (then its content is copied from the input file when the member is written).
+        """
+        import stat
+        import tempfile
+        import zlib
+        fileStat = os.lstat(fileName)
+        if stat.S_ISLNK(fileStat.st_mode):
+            data = os.readlink(fileName).encode('utf-8')
+            return 0, zlib.crc32(data), len(data), len(data), data, stat.S_IFLNK | 0o777
+        executable = fileStat.st_mode & stat.S_IXUSR or os.path.splitext(fileName)[1].lower() in ('.exe', '.dll')
+        mode = stat.S_IFREG | (0o755 if executable else 0o644)
+        crc = 0
+        size = 0
+        compressor = zlib.compressobj(compressionLevel, zlib.DEFLATED, -15) if compressionLevel else None
+        compressedData = tempfile.SpooledTemporaryFile(maxMemorySize) if compressor else None
+        try:
+            with open(fileName, 'rb') as f:
+                for chunk in iter(lambda: f.read(chunkSize), b''):
+                    crc = zlib.crc32(chunk, crc)
+                    size += len(chunk)
+                    if compressor:
+                        compressedData.write(compressor.compress(chunk))
+            if compressor:
+                compressedData.write(compressor.flush())
+                compressedSize = compressedData.tell()
+                if compressedSize < size:
+                    compressedData.seek(0)
+                    return 8, crc, size, compressedSize, compressedData, mode
+                compressedData.close()
+        except:
+            if compressedData:
+                compressedData.close()
+            raise
+        return 0, crc, size, size, None, mode
+
+    def packageExtension(self, inputDirectory, outputDirectory, extensionName=None,
+                         compressionLevel=6, numberOfThreads=None, dateTime=(1980, 1, 1, 0, 0, 0)):
+        """
+        Creates an extension archive (zip) from an extension install tree (directory containing
+        lib/Slicer-X.Y, share/Slicer-X.Y, ...), using the archive layout of the current platform.
+        Members are compressed in parallel worker threads. The archive is reproducible: members
+        are sorted, and timestamps and permissions are normalized, so identical inputs give
+        byte-identical archives.
+        :param extensionName: if not specified, it is the name of the .s4ext file of the install tree.
+        Returns the archive file name.
+        """
+        import collections
+        import shutil
+        import stat
+        import struct
+        from concurrent.futures import ThreadPoolExecutor
+        if not os.path.isdir(inputDirectory):
+            raise Exception("Directory does not exist: %s" % inputDirectory)
+        if extensionName is None:
+            descriptionDirectory = os.path.join(inputDirectory, "share", self.getSlicerVersionDirectory())
+            descriptionFiles = [fileName for fileName in (os.listdir(descriptionDirectory)
+                                if os.path.isdir(descriptionDirectory) else []) if fileName.endswith('.s4ext')]
+            if len(descriptionFiles) != 1:
+                raise Exception("Cannot determine extension name: %s must contain one extension description (.s4ext)"
+                                % descriptionDirectory)
+            extensionName = os.path.splitext(descriptionFiles[0])[0]
+        rootName, installTreePath = self.getExtensionArchiveLayout(extensionName)
+        members = self._listPackageMembers(inputDirectory, installTreePath)
+        outputFileName = os.path.join(outputDirectory, rootName + ".zip")
+        logging.info("Packaging %s into %s", inputDirectory, outputFileName)
+
+        dosTime = (dateTime[3] << 11) | (dateTime[4] << 5) | (dateTime[5] // 2)
+        dosDate = ((dateTime[0] - 1980) << 9) | (dateTime[1] << 5) | dateTime[2]
+        maxValue = 0xFFFFFFFF
+        centralDirectory = []
+        if numberOfThreads is None:
+            numberOfThreads = os.cpu_count() or 1
+
+        def writeMember(outputFile, archiveName, fileName, method, crc, size, compressedSize, data, mode):
+            name = archiveName.encode('utf-8')
+            flags = 0x800 if not archiveName.isascii() else 0
+            offset = outputFile.tell()
+            zip64 = size >= maxValue or compressedSize >= maxValue
+            localExtra = struct.pack('<HHQQ', 1, 16, size, compressedSize) if zip64 else b''
+            version = 45 if zip64 or offset >= maxValue else 20
+            outputFile.write(struct.pack('<IHHHHHIIIHH', 0x04034b50, version, flags, method, dosTime, dosDate, crc,
+                                         maxValue if zip64 else compressedSize, maxValue if zip64 else size,
+                                         len(name), len(localExtra)))
+            outputFile.write(name)
+            outputFile.write(localExtra)
+            if data is None:
+                # Stored file, copy its content
+                with open(fileName, 'rb') as f:
+                    remainingSize = size
+                    while remainingSize:
+                        chunk = f.read(min(remainingSize, 1024 * 1024))
+                        if not chunk:
+                            raise Exception("File changed while packaging: %s" % fileName)
+                        outputFile.write(chunk)
+                        remainingSize -= len(chunk)
+            elif isinstance(data, bytes):
+                outputFile.write(data)
+            else:
+                with data:
+                    shutil.copyfileobj(data, outputFile, 1024 * 1024)
+            # Central directory record (zip64 extra field only contains the values that do not fit)
+            zip64Values = [value for value in (size, compressedSize, offset) if value >= maxValue]
+            extra = struct.pack('<HH%dQ' % len(zip64Values), 1, 8 * len(zip64Values), *zip64Values) if zip64Values else b''
+            externalAttributes = (mode << 16) | (0x10 if stat.S_ISDIR(mode) else 0)
+            centralDirectory.append(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | version, version,
+                                                flags, method, dosTime, dosDate, crc,
+                                                min(compressedSize, maxValue), min(size, maxValue), len(name), len(extra),
+                                                0, 0, 0, externalAttributes, min(offset, maxValue)) + name + extra)
+
+        with open(outputFileName, 'wb') as outputFile, ThreadPoolExecutor(numberOfThreads) as executor:
+            # Members are compressed in parallel, but written in order. The number of pending members
+            # is limited and files are compressed in chunks (large compressed data is spooled to disk)
+            # to bound memory usage.
+            pending = collections.deque()
+            for archiveName, fileName in members + [(None, None)]:
+                if archiveName is not None:
+                    if archiveName.endswith("/"):
+                        pending.append((archiveName, fileName, None))
+                    else:
+                        pending.append((archiveName, fileName, executor.submit(self._compressPackageMember,
+                                                                               fileName, compressionLevel)))
+                while pending and (archiveName is None or len(pending) > 2 * numberOfThreads):
+                    pendingName, pendingFileName, future = pending.popleft()
+                    if future is None:
+                        writeMember(outputFile, pendingName, None, 0, 0, 0, 0, b'', stat.S_IFDIR | 0o755)
+                    else:
+                        writeMember(outputFile, pendingName, pendingFileName, *future.result())
+
+            # End of central directory
+            centralDirectoryOffset = outputFile.tell()
+            for record in centralDirectory:
+                outputFile.write(record)
+            centralDirectorySize = outputFile.tell() - centralDirectoryOffset
+            numberOfEntries = len(centralDirectory)
+            if numberOfEntries >= 0xFFFF or centralDirectoryOffset >= maxValue or centralDirectorySize >= maxValue:
+                zip64EndOffset = outputFile.tell()
+                outputFile.write(struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, 45, 45, 0, 0, numberOfEntries,
+                                             numberOfEntries, centralDirectorySize, centralDirectoryOffset))
+                outputFile.write(struct.pack('<IIQI', 0x07064b50, 0, zip64EndOffset, 1))
+            outputFile.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, min(numberOfEntries, 0xFFFF),
+                                         min(numberOfEntries, 0xFFFF), min(centralDirectorySize, maxValue),
+                                         min(centralDirectoryOffset, maxValue), 0))
+        logging.info("Extension package created: %s (%d members)", outputFileName, len(members))
+        return outputFileName
+
+    def parseExtensionDescription(self, text):
+        """
+        Parses the content of an extension description (.s4ext) file.
+        First token of each non-comment line is the keyword and the rest of the line is the value.
+        Returns a dictionary mapping keywords to values.
+        """
+        description = {}
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            keywordValue = line.split(None, 1)
+            description[keywordValue[0]] = keywordValue[1].strip() if len(keywordValue) > 1 else ''
+        return description
+
+    def readExtensionDescription(self, fileName):
+        """
+        Reads an extension description (.s4ext) file. Parsed files are cached until they are modified.
+        """
+        fileStat = os.stat(fileName)
+        cacheKey = os.path.abspath(fileName)
+        cached = self.extensionDescriptionCache.get(cacheKey)
+        if cached and cached[0] == fileStat.st_mtime_ns and cached[1] == fileStat.st_size:
+            return cached[2]
+        with open(fileName, 'r', encoding='utf-8', errors='replace') as f:
+            description = self.parseExtensionDescription(f.read())
+        self.extensionDescriptionCache[cacheKey] = (fileStat.st_mtime_ns, fileStat.st_size, description)
+        return description
+
+    def readExtensionDescriptions(self, fileNames):
+        """
+        Reads extension description (.s4ext) files in parallel.
+        Returns a dictionary mapping extension names (file names without extension) to descriptions.
+        Raises an exception if several files describe the same extension.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        fileNames = list(fileNames)
+        extensionFileNames = {}
+        for fileName in fileNames:
+            extensionName = os.path.splitext(os.path.basename(fileName))[0]
+            if extensionName in extensionFileNames:
+                raise Exception("Extension %s is described by several files: %s, %s"
+                                % (extensionName, extensionFileNames[extensionName], fileName))
+            extensionFileNames[extensionName] = fileName
+        with ThreadPoolExecutor() as executor:
+            descriptions = list(executor.map(self.readExtensionDescription, fileNames))
+        return {os.path.splitext(os.path.basename(fileName))[0]: description
+                for fileName, description in zip(fileNames, descriptions)}
+
+    def readExtensionArchiveDescription(self, filename):
+        """
+        Reads the extension description (.s4ext) file stored in an extension archive.
+        Returns (extensionName, description), or (None, None) if the archive has no description file.
+        """
+        import tarfile
+        import zipfile
+        if zipfile.is_zipfile(filename):
+            with zipfile.ZipFile(filename) as archive:
+                memberNames = [name for name in archive.namelist() if name.endswith('.s4ext')]
+                if not memberNames:
+                    return None, None
+                memberName = min(memberNames, key=len)
+                text = archive.read(memberName).decode('utf-8', 'replace')
+        else:
+            with tarfile.open(filename) as archive:
+                members = [member for member in archive if member.isfile() and member.name.endswith('.s4ext')]
+                if not members:
+                    return None, None
+                member = min(members, key=lambda member: len(member.name))
+                memberName = member.name
+                text = archive.extractfile(member).read().decode('utf-8', 'replace')
+        extensionName = os.path.splitext(os.path.basename(memberName))[0]
+        return extensionName, self.parseExtensionDescription(text)
+
+    def getExtensionDependencies(self, description):
+        """
+        Returns the list of extensions an extension depends on ("NA" means no dependency).
+        """
+        return [name for name in description.get('depends', '').split() if name != 'NA']
+
+    def getExtensionDependencyGraph(self, descriptions):
+        """
+        Returns a dictionary mapping each extension name to the list of extensions it depends on.
+        """
+        return {name: self.getExtensionDependencies(descriptions[name]) for name in descriptions}
+
+    def getMissingExtensionDependencies(self, descriptions, availableExtensionNames=()):
+        """
+        Returns a dictionary mapping extension names to the dependencies that are neither
+        described nor in availableExtensionNames.
+        """
+        availableExtensionNames = set(availableExtensionNames) | set(descriptions)
+        graph = self.getExtensionDependencyGraph(descriptions)
+        missingDependencies = {}
+        for name in graph:
+            missing = [dependency for dependency in graph[name] if dependency not in availableExtensionNames]
+            if missing:
+                missingDependencies[name] = missing
+        return missingDependencies
+
+    def getExtensionInstallOrder(self, descriptions):
+        """
+        Returns extension names sorted so that each extension comes after its dependencies.
+        Raises an exception if there is a circular dependency.
+        """
+        return self.sortByDependencies(self.getExtensionDependencyGraph(descriptions))
+
     # From ExtensionWizard.py in Slicer
     def _settingsList(self, settings, key):
         """
@@ -218,9 +841,14 @@ class DeveloperToolsForExtensionsLogic(ScriptedLoadableModuleLogic):
         return [] if value is None else value
 
     # From ExtensionWizard.py in Slicer
-    def addModule(self, fileName, permanent):
+    def addModule(self, fileName, permanent, profile=False, profileCalls=False, profileIsolatedImport=False):
         """
         Loads a module in the Slicer factory while Slicer is running
+        :param profile: if True, the duration of each loading phase is measured and stored
+          in moduleLoadProfiles.
+        :param profileCalls: if True (and profile is True), cProfile call statistics are collected too.
+        :param profileIsolatedImport: if True (and profile is True), the import time of the module
+          is also measured in a separate process (see measureModuleImportTime).
         """
         logging.info('Module addition process started')
         # Determine which modules in above are not already loaded
@@ -233,34 +861,645 @@ class DeveloperToolsForExtensionsLogic(ScriptedLoadableModuleLogic):
             raise Exception("Abort: Module already loaded")
         if permanent:
             # Add module(s) to permanent search paths, if requested
-            settings = slicer.app.revisionUserSettings()
-            rawSearchPaths = list(self._settingsList(settings, "Modules/AdditionalPaths"))
-            searchPaths = [qt.QDir(path) for path in rawSearchPaths]
+            self.addModuleSearchPaths([myModule.dirPath])
 
-            modified = False
-            rawPath = myModule.dirPath
-            path = qt.QDir(rawPath)
-            if path not in searchPaths:
-                searchPaths.append(path)
-                rawSearchPaths.append(rawPath)
-                modified = True
+        moduleProfile = self._startModuleProfile(myModule.key, fileName, profileCalls) if profile else None
+        try:
+            if moduleProfile is not None and profileIsolatedImport:
+                self._profileIsolatedImport(moduleProfile)
 
-            if modified:
-                settings.setValue("Modules/AdditionalPaths", rawSearchPaths)
+            # Register requested module(s)
+            self._profilePhase(moduleProfile, 'register', factory.registerModule, qt.QFileInfo(fileName))
+            if not factory.isRegistered(myModule.key):
+                raise Exception("Abort: Failed to register module %s" % myModule.key)
 
-        # Register requested module(s)
-        factory.registerModule(qt.QFileInfo(fileName))
-        if not factory.isRegistered(myModule.key):
-            raise Exception("Abort: Failed to register module %s", myModule.key)
+            # Instantiate and load requested module(s)
+            if not self._profilePhase(moduleProfile, 'instantiate', factory.loadModules, [myModule.key]):
+                raise Exception("Abort: The module factory manager reported an error. \
+                         One or more of the requested module(s) and/or \
+                         dependencies thereof may not have been loaded.")
 
-        # Instantiate and load requested module(s)
-        if not factory.loadModules([myModule.key]):
-            raise Exception("Abort: The module factory manager reported an error. \
-                     One or more of the requested module(s) and/or \
-                     dependencies thereof may not have been loaded.")
+            if moduleProfile is not None:
+                self._profilePhase(moduleProfile, 'widgetSetup', self._setupModuleWidget, myModule.key)
+        finally:
+            if moduleProfile is not None:
+                self._finishModuleProfile(moduleProfile)
         logging.info('Module addition process completed')
         return True
 
+    def _startModuleProfile(self, name, fileName, profileCalls):
+        """
+        Returns a new module load profile. Phases that are not measured are left to None.
+        """
+        moduleProfile = {'name': name, 'fileName': fileName, 'isolatedImport': None, 'isolatedImportError': None,
+                         'callStats': None, 'profiler': None}
+        for phase in self.moduleLoadPhases:
+            moduleProfile[phase] = None
+        if profileCalls:
+            import cProfile
+            moduleProfile['profiler'] = cProfile.Profile()
+            moduleProfile['profiler'].enable()
+        return moduleProfile
+
+    def _finishModuleProfile(self, moduleProfile, numberOfCalls=25):
+        """
+        Stops call statistics collection and stores the profile in moduleLoadProfiles.
+        """
+        profiler = moduleProfile.pop('profiler')
+        if profiler:
+            profiler.disable()
+            import io
+            import pstats
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(numberOfCalls)
+            moduleProfile['callStats'] = stream.getvalue()
+            logging.info("Call statistics for module %s:\n%s", moduleProfile['name'], moduleProfile['callStats'])
+        logging.info("Module %s load profile (seconds): %s", moduleProfile['name'],
+                     ", ".join("%s=%s" % (phase, "n/a" if moduleProfile[phase] is None else "%.3f" % moduleProfile[phase])
+                               for phase in self.moduleLoadPhases + ['isolatedImport']))
+        self.moduleLoadProfiles.append(moduleProfile)
+
+    def _profilePhase(self, moduleProfile, phase, function, *args):
+        """
+        Calls function and stores its duration in the profile (if a profile is given).
+        """
+        startTime = time.time()
+        try:
+            return function(*args)
+        finally:
+            if moduleProfile is not None:
+                moduleProfile[phase] = time.time() - startTime
+
+    def measureModuleImport(self, fileName, timeoutSec=300):
+        """
+        Imports a scripted module source in a separate Slicer process, so that the top-level code of
+        the module is not run again in this application and already imported dependencies do not hide
+        their cost. Returns a dictionary with the import time in seconds ('importTime') and the sorted
+        list of the Python modules that the import added to sys.modules ('importedModules').
+        """
+        import json
+        import subprocess
+        moduleName = os.path.splitext(os.path.basename(fileName))[0]
+        code = ("import json, os, sys, time\n"
+                "fileName = %r\n"
+                "sys.path.insert(0, os.path.dirname(fileName))\n"
+                "modulesBefore = set(sys.modules)\n"
+                "startTime = time.perf_counter()\n"
+                "with open(fileName, 'rb') as f:\n"
+                "    exec(compile(f.read(), fileName, 'exec'), {'__name__': %r, '__file__': fileName})\n"
+                "importTime = time.perf_counter() - startTime\n"
+                "print('ModuleImport=' + json.dumps({'importTime': importTime,\n"
+                "    'importedModules': sorted(set(sys.modules) - modulesBefore)}))\n"
+                "sys.exit(0)\n") % (fileName, moduleName)
+        args = [slicer.app.applicationFilePath(), "--no-splash", "--no-main-window", "--disable-cli-modules",
+                "--disable-scripted-loadable-modules", "--python-code", code]
+        result = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True,
+                                timeout=timeoutSec)
+        for line in result.stdout.splitlines():
+            if line.startswith('ModuleImport='):
+                return json.loads(line.split('=', 1)[1])
+        raise Exception("Failed to import module %s:\n%s" % (moduleName, result.stdout))
+
+    def measureModuleImportTime(self, fileName, timeoutSec=300):
+        """
+        Measures the time needed to import a scripted module source (including the modules it imports)
+        in a separate Slicer process (see measureModuleImport). Returns the import time in seconds.
+        """
+        return self.measureModuleImport(fileName, timeoutSec)['importTime']
+
+    def _profileIsolatedImport(self, moduleProfile):
+        """
+        Measures the import time of a module in a separate process (see measureModuleImportTime) and stores it
+        in the profile. Call statistics collection is paused meanwhile, as this process only waits.
+        If the measurement fails (for example because the module imports other scripted modules, which are
+        not available in the separate process), the error is stored in the profile and logged.
+        """
+        profiler = moduleProfile['profiler']
+        if profiler:
+            profiler.disable()
+        try:
+            moduleProfile['isolatedImport'] = self.measureModuleImportTime(moduleProfile['fileName'])
+        except Exception as e:
+            moduleProfile['isolatedImport'] = None
+            moduleProfile['isolatedImportError'] = str(e)
+            logging.warning("Failed to measure isolated import time of module %s: %s", moduleProfile['name'], e)
+        finally:
+            if profiler:
+                profiler.enable()
+
+    def _setupModuleWidget(self, moduleName):
+        """
+        Creates the widget representation of a module (this calls its setup() method).
+        """
+        module = slicer.app.moduleManager().module(moduleName)
+        if module:
+            module.widgetRepresentation()
+
+    def profileInstalledModules(self, profileCalls=False):
+        """
+        Measures the load cost of the scripted modules found in the additional module paths.
+        Registration and instantiation have already happened for these modules, so the import time
+        is measured in a separate process and widget setup is measured if the module widget
+        has not been created yet.
+        """
+        searchPaths = set(self._normalizeModulePath(path) for path in self.getModuleSearchPaths())
+        moduleManager = slicer.app.moduleManager()
+        profiles = []
+        for moduleName in moduleManager.modulesNames():
+            module = moduleManager.module(moduleName)
+            if not module or not module.path.endswith('.py'):
+                continue
+            if self._normalizeModulePath(os.path.dirname(module.path)) not in searchPaths:
+                continue
+            moduleProfile = self._startModuleProfile(moduleName, module.path, profileCalls)
+            try:
+                self._profileIsolatedImport(moduleProfile)
+                if not module.isWidgetRepresentationCreated():
+                    self._profilePhase(moduleProfile, 'widgetSetup', self._setupModuleWidget, moduleName)
+            except Exception as e:
+                logging.error("Failed to profile module %s: %s", moduleName, e)
+            finally:
+                self._finishModuleProfile(moduleProfile)
+            profiles.append(moduleProfile)
+        return profiles
+
+    def getModuleLoadProfilesAsTable(self, tableNode):
+        """
+        Fills a table node with the stored module load profiles (durations in milliseconds,
+        phases that were not measured are set to NaN).
+        """
+        nameColumn = vtk.vtkStringArray()
+        nameColumn.SetName("Module")
+        phaseColumns = {}
+        for phase, title in zip(self.moduleLoadPhases, ["Register", "Import and instantiate", "Widget setup"]):
+            phaseColumns[phase] = vtk.vtkDoubleArray()
+            phaseColumns[phase].SetName(title + " (ms)")
+        totalColumn = vtk.vtkDoubleArray()
+        totalColumn.SetName("Total (ms)")
+        # Measured in a separate process, not included in the total
+        isolatedImportColumn = vtk.vtkDoubleArray()
+        isolatedImportColumn.SetName("Isolated import (ms)")
+
+        for moduleProfile in self.moduleLoadProfiles:
+            nameColumn.InsertNextValue(moduleProfile['name'])
+            total = 0.0
+            for phase in self.moduleLoadPhases:
+                duration = moduleProfile[phase]
+                phaseColumns[phase].InsertNextValue(float('nan') if duration is None else duration * 1000.0)
+                total += duration or 0.0
+            totalColumn.InsertNextValue(total * 1000.0)
+            isolatedImport = moduleProfile['isolatedImport']
+            isolatedImportColumn.InsertNextValue(float('nan') if isolatedImport is None else isolatedImport * 1000.0)
+
+        tableNode.RemoveAllColumns()
+        tableNode.AddColumn(nameColumn)
+        for phase in self.moduleLoadPhases:
+            tableNode.AddColumn(phaseColumns[phase])
+        tableNode.AddColumn(totalColumn)
+        tableNode.AddColumn(isolatedImportColumn)
+        tableNode.Modified()
+
+    def _normalizeModulePath(self, path):
+        """
+        Returns a normalized path that can be used to compare module search paths.
+        """
+        return os.path.normcase(os.path.realpath(os.path.abspath(path)))
+
+    def getModuleSearchPaths(self):
+        """
+        Returns the permanent module search paths (Modules/AdditionalPaths setting).
+        """
+        settings = slicer.app.revisionUserSettings()
+        return list(self._settingsList(settings, "Modules/AdditionalPaths"))
+
+    def setModuleSearchPaths(self, rawPaths):
+        """
+        Sets the permanent module search paths (Modules/AdditionalPaths setting).
+        """
+        settings = slicer.app.revisionUserSettings()
+        settings.setValue("Modules/AdditionalPaths", list(rawPaths))
+
+    def addModuleSearchPaths(self, rawPaths):
+        """
+        Adds the given directories to the permanent module search paths (if not already there).
+        Returns the list of paths that were added.
+        """
+        rawSearchPaths = self.getModuleSearchPaths()
+        searchPaths = set(self._normalizeModulePath(path) for path in rawSearchPaths)
+        addedPaths = []
+        for rawPath in rawPaths:
+            path = self._normalizeModulePath(rawPath)
+            if path not in searchPaths:
+                searchPaths.add(path)
+                rawSearchPaths.append(rawPath)
+                addedPaths.append(rawPath)
+        if addedPaths:
+            self.setModuleSearchPaths(rawSearchPaths)
+        return addedPaths
+
+    def removeModuleSearchPaths(self, rawPaths):
+        """
+        Removes the given directories (and all their duplicates) from the permanent module search paths.
+        Returns the list of paths that were removed.
+        """
+        pathsToRemove = set(self._normalizeModulePath(path) for path in rawPaths)
+        rawSearchPaths = self.getModuleSearchPaths()
+        keptPaths = [path for path in rawSearchPaths if self._normalizeModulePath(path) not in pathsToRemove]
+        removedPaths = [path for path in rawSearchPaths if self._normalizeModulePath(path) in pathsToRemove]
+        if removedPaths:
+            self.setModuleSearchPaths(keptPaths)
+        return removedPaths
+
+    def cleanModuleSearchPaths(self, removeMissing=True):
+        """
+        Removes duplicate (and, if removeMissing is True, non-existent) entries from the permanent
+        module search paths. Returns the list of removed duplicate and missing paths.
+        """
+        searchPaths = set()
+        keptPaths = []
+        duplicatePaths = []
+        missingPaths = []
+        for rawPath in self.getModuleSearchPaths():
+            path = self._normalizeModulePath(rawPath)
+            if path in searchPaths:
+                duplicatePaths.append(rawPath)
+                continue
+            if removeMissing and not os.path.isdir(path):
+                missingPaths.append(rawPath)
+                continue
+            searchPaths.add(path)
+            keptPaths.append(rawPath)
+        if duplicatePaths or missingPaths:
+            self.setModuleSearchPaths(keptPaths)
+            logging.info("Removed module search paths: duplicate: %s, missing: %s", duplicatePaths, missingPaths)
+        return {'duplicate': duplicatePaths, 'missing': missingPaths}
+
+    def measureModuleSearchPaths(self):
+        """
+        Measures the cost of scanning each permanent module search path.
+        At startup, Slicer lists the content of each search path and offers every file to the
+        module factories, therefore the number of files and the listing time are reported.
+        """
+        moduleFileExtensions = ('.py', '.so', '.dll', '.dylib', '.xml')
+        searchPaths = set()
+        measurements = []
+        for rawPath in self.getModuleSearchPaths():
+            path = self._normalizeModulePath(rawPath)
+            measurement = {'path': rawPath, 'exists': os.path.isdir(path), 'duplicate': path in searchPaths,
+                           'fileCount': 0, 'moduleFileCount': 0, 'scanTime': 0.0}
+            searchPaths.add(path)
+            if measurement['exists']:
+                startTime = time.time()
+                try:
+                    for entry in os.scandir(path):
+                        if entry.is_file():
+                            measurement['fileCount'] += 1
+                            if entry.name.lower().endswith(moduleFileExtensions):
+                                measurement['moduleFileCount'] += 1
+                except OSError as e:
+                    logging.warning("Cannot scan module search path %s: %s", rawPath, e)
+                measurement['scanTime'] = time.time() - startTime
+            measurements.append(measurement)
+        return measurements
+
+    def getModuleSearchPathsAsTable(self, tableNode, measurements=None):
+        """
+        Fills a table node with the scan cost of the permanent module search paths.
+        """
+        if measurements is None:
+            measurements = self.measureModuleSearchPaths()
+        pathColumn = vtk.vtkStringArray()
+        pathColumn.SetName("Path")
+        statusColumn = vtk.vtkStringArray()
+        statusColumn.SetName("Status")
+        fileCountColumn = vtk.vtkIntArray()
+        fileCountColumn.SetName("Files")
+        moduleFileCountColumn = vtk.vtkIntArray()
+        moduleFileCountColumn.SetName("Module files")
+        scanTimeColumn = vtk.vtkDoubleArray()
+        scanTimeColumn.SetName("Scan time (ms)")
+        for measurement in measurements:
+            pathColumn.InsertNextValue(measurement['path'])
+            if not measurement['exists']:
+                statusColumn.InsertNextValue("missing")
+            elif measurement['duplicate']:
+                statusColumn.InsertNextValue("duplicate")
+            else:
+                statusColumn.InsertNextValue("ok")
+            fileCountColumn.InsertNextValue(measurement['fileCount'])
+            moduleFileCountColumn.InsertNextValue(measurement['moduleFileCount'])
+            scanTimeColumn.InsertNextValue(measurement['scanTime'] * 1000.0)
+        tableNode.RemoveAllColumns()
+        for column in [pathColumn, statusColumn, fileCountColumn, moduleFileCountColumn, scanTimeColumn]:
+            tableNode.AddColumn(column)
+        tableNode.Modified()
+
+    def _readScriptedModuleDependencies(self, fileName):
+        """
+        Returns the dependencies declared by a scripted module file, without importing it.
+        Returns None if the file does not define a scripted module (a class deriving from
+        ScriptedLoadableModule that has the same name as the file).
+        """
+        import ast
+        key = os.path.splitext(os.path.basename(fileName))[0]
+        try:
+            with open(fileName, 'rb') as f:
+                source = f.read()
+            # Cheap check before parsing the whole file
+            if b'ScriptedLoadableModule' not in source:
+                return None
+            tree = ast.parse(source, fileName)
+        except (OSError, SyntaxError, ValueError) as e:
+            logging.warning("Cannot read %s: %s", fileName, e)
+            return None
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef) or node.name != key:
+                continue
+            baseNames = [base.attr if isinstance(base, ast.Attribute) else getattr(base, 'id', None)
+                         for base in node.bases]
+            if 'ScriptedLoadableModule' not in baseNames:
+                continue
+            # Look for "self.parent.dependencies = [...]" (or "parent.dependencies = [...]")
+            dependencies = []
+            for statement in ast.walk(node):
+                if not isinstance(statement, ast.Assign):
+                    continue
+                for target in statement.targets:
+                    if isinstance(target, ast.Attribute) and target.attr == 'dependencies':
+                        try:
+                            dependencies = list(ast.literal_eval(statement.value))
+                        except ValueError:
+                            logging.warning("Cannot determine dependencies of module %s", key)
+            return dependencies
+        return None
+
+    def findScriptedModules(self, directory):
+        """
+        Finds all scripted modules in a directory tree. Files are inspected in parallel.
+        Returns a dictionary mapping module names to file name and declared dependencies.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        if not os.path.isdir(directory):
+            raise Exception("Directory does not exist: %s" % directory)
+        candidateFileNames = []
+        for dirPath, dirNames, fileNames in os.walk(directory):
+            dirNames[:] = [dirName for dirName in dirNames
+                           if dirName != '__pycache__' and not dirName.startswith('.')]
+            candidateFileNames.extend(os.path.join(dirPath, fileName)
+                                      for fileName in fileNames if fileName.endswith('.py'))
+        candidateFileNames.sort()
+        with ThreadPoolExecutor() as executor:
+            allDependencies = list(executor.map(self._readScriptedModuleDependencies, candidateFileNames))
+        modules = {}
+        for fileName, dependencies in zip(candidateFileNames, allDependencies):
+            if dependencies is None:
+                continue
+            key = os.path.splitext(os.path.basename(fileName))[0]
+            if key in modules:
+                logging.warning("Module %s found multiple times, %s is ignored", key, fileName)
+                continue
+            modules[key] = {'fileName': fileName, 'dependencies': dependencies}
+        return modules
+
+    def sortByDependencies(self, dependencies):
+        """
+        Sorts names so that each name appears after its dependencies.
+        :param dependencies: dictionary mapping each name to the list of names it depends on.
+        Dependencies that are not keys of the dictionary are ignored (they are expected to be
+        already available).
+        """
+        remainingDependencies = {}
+        dependents = {name: [] for name in dependencies}
+        for name in dependencies:
+            remainingDependencies[name] = set(dependency for dependency in dependencies[name]
+                                              if dependency in dependencies and dependency != name)
+            for dependency in remainingDependencies[name]:
+                dependents[dependency].append(name)
+        ready = sorted(name for name in dependencies if not remainingDependencies[name])
+        sortedNames = []
+        while ready:
+            name = ready.pop(0)
+            sortedNames.append(name)
+            for dependent in sorted(dependents[name]):
+                remainingDependencies[dependent].discard(name)
+                if not remainingDependencies[dependent]:
+                    ready.append(dependent)
+        if len(sortedNames) != len(dependencies):
+            # Follow unresolved dependencies until a name is visited twice: this is a cycle
+            name = sorted(name for name in dependencies if remainingDependencies[name])[0]
+            path = []
+            while name not in path:
+                path.append(name)
+                name = sorted(remainingDependencies[name])[0]
+            cycle = path[path.index(name):] + [name]
+            raise Exception("Abort: Circular dependency: %s" % " -> ".join(cycle))
+        return sortedNames
+
+    def addModules(self, fileNames, permanent):
+        """
+        Loads several modules in the Slicer factory while Slicer is running.
+        All modules are registered first, then loaded in a single factory pass.
+        Modules that are already loaded are skipped (reported as not loaded, with an error).
+        Returns the per-module results and the time spent loading.
+        """
+        logging.info('Modules addition process started')
+        factory = slicer.app.moduleManager().factoryManager()
+        results = []
+        for fileName in fileNames:
+            key = os.path.splitext(os.path.basename(fileName))[0]
+            result = {'name': key, 'fileName': fileName, 'registered': False, 'registerTime': 0.0,
+                      'loaded': False, 'error': None}
+            if factory.isLoaded(key):
+                logging.warning("Module %s already loaded", key)
+                result['error'] = 'Module already loaded'
+            results.append(result)
+        if permanent:
+            self.addModuleSearchPaths(sorted(set(os.path.dirname(result['fileName']) for result in results)))
+
+        for result in results:
+            if result['error']:
+                continue
+            startTime = time.time()
+            factory.registerModule(qt.QFileInfo(result['fileName']))
+            result['registerTime'] = time.time() - startTime
+            result['registered'] = factory.isRegistered(result['name'])
+            if not result['registered']:
+                logging.error("Failed to register module %s", result['name'])
+                result['error'] = 'Module registration failed'
+
+        keys = [result['name'] for result in results if result['registered']]
+        startTime = time.time()
+        if keys and not factory.loadModules(keys):
+            logging.error("The module factory manager reported an error. One or more of the requested \
+                          module(s) and/or dependencies thereof may not have been loaded.")
+        loadTime = time.time() - startTime
+
+        for result in results:
+            if result['error']:
+                continue
+            result['loaded'] = factory.isLoaded(result['name'])
+            if not result['loaded']:
+                result['error'] = 'Module loading failed'
+            logging.info("Module %s: %s", result['name'], "loaded" if result['loaded'] else "not loaded")
+        logging.info('Modules addition process completed in %.3fs', loadTime)
+        return {'modules': results, 'loadTime': loadTime}
+
+    def addModulesFromDirectory(self, directory, permanent):
+        """
+        Loads all scripted modules found in a directory tree, in dependency order.
+        """
+        modules = self.findScriptedModules(directory)
+        if not modules:
+            raise Exception("Abort: No scripted module found in %s" % directory)
+        sortedNames = self.sortByDependencies({name: modules[name]['dependencies'] for name in modules})
+        return self.addModules([modules[name]['fileName'] for name in sortedNames], permanent)
+
+
+#
+# DeveloperToolsForExtensionsInstallJob
+#
+
+
+class DeveloperToolsForExtensionsInstallJob(object):
+    """Installs an extension archive in stages: validate, hash, verify and register.
+    Hash and verify run on a worker thread. Register (extraction of the archive and registration
+    by the extensions manager model) runs on the main thread and blocks the application.
+    Progress and completion are reported on the main thread through the callbacks:
+    - progressCallback(stage, progress): stage name and overall progress (0-1)
+    - finishedCallback(success, message)
+    """
+
+    # Stage weights, used for computing overall progress
+    stages = [('validate', 0.02), ('hash', 0.1), ('verify', 0.08), ('register', 0.8)]
+
+    def __init__(self, logic, filename, progressCallback=None, finishedCallback=None, expectedSha256=None):
+        import queue
+        import threading
+        self.logic = logic
+        self.filename = filename
+        self.progressCallback = progressCallback
+        self.finishedCallback = finishedCallback
+        self.expectedSha256 = expectedSha256
+        self.cancelEvent = threading.Event()
+        self.events = queue.Queue()
+        self.thread = None
+        self.timer = None
+        self.result = None
+        self.lastProgress = -1.0
+
+    def _stageStart(self, stage):
+        progress = 0.0
+        for stageName, weight in self.stages:
+            if stageName == stage:
+                return progress, weight
+            progress += weight
+        raise ValueError("Invalid stage: " + stage)
+
+    def _queueProgress(self, stage, stageProgress):
+        """Called from the worker thread"""
+        start, weight = self._stageStart(stage)
+        progress = start + weight * stageProgress
+        # Limit the number of events
+        if progress - self.lastProgress >= 0.01 or stageProgress >= 1.0:
+            self.lastProgress = progress
+            self.events.put(('progress', stage, progress))
+
+    def _reportProgress(self, stage, progress):
+        if self.progressCallback:
+            self.progressCallback(stage, progress)
+
+    def start(self):
+        import threading
+        self._reportProgress('validate', 0.0)
+        try:
+            if not self.logic.CheckFileExistsCaseSensitive(self.filename):
+                raise Exception('Extension file does not exist: %s' % self.filename)
+            self.logic.PlatformCheck(self.filename)
+        except Exception as e:
+            self._finish(False, str(e))
+            return
+        logging.info('Extension installation process started')
+        self.thread = threading.Thread(target=self._run, name='DeveloperToolsForExtensionsInstall')
+        self.thread.daemon = True
+        self.thread.start()
+        self.timer = qt.QTimer()
+        self.timer.setInterval(50)
+        self.timer.connect('timeout()', self._processEvents)
+        self.timer.start()
+
+    def cancel(self):
+        self.cancelEvent.set()
+
+    def abort(self):
+        """Cancels the installation without calling the callbacks anymore (for example when the
+        widget that started the installation is destroyed)."""
+        self.progressCallback = None
+        self.finishedCallback = None
+        self.cancelEvent.set()
+        if self.timer:
+            self.timer.stop()
+            self.timer = None
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def isRunning(self):
+        return self.thread is not None and self.timer is not None
+
+    def _run(self):
+        """Worker thread"""
+        try:
+            result = self.logic.verifyExtensionArchive(self.filename, self.expectedSha256,
+                                                       self._queueProgress, self.cancelEvent)
+            self.events.put(('verified', result))
+        except Exception as e:
+            self.events.put(('error', str(e)))
+
+    def _processEvents(self):
+        """Main thread"""
+        import queue
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                return
+            if event[0] == 'progress':
+                self._reportProgress(event[1], event[2])
+            elif event[0] == 'verified':
+                self.result = event[1]
+                self._register()
+                return
+            else:
+                self._finish(False, event[1])
+                return
+
+    def _register(self):
+        self._reportProgress('register', self._stageStart('register')[0])
+        if self.cancelEvent.is_set():
+            self._finish(False, 'Extension installation cancelled')
+            return
+        try:
+            if slicer.app.extensionsManagerModel().installExtension(self.filename):
+                logging.info('Extension installation process completed')
+                self._reportProgress('register', 1.0)
+                self._finish(True, 'Extension installed')
+            else:
+                self._finish(False, 'Extension installation failed')
+        except Exception as e:
+            self._finish(False, str(e))
+
+    def _finish(self, success, message):
+        if self.timer:
+            self.timer.stop()
+            self.timer = None
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+        if not success:
+            logging.error('Extension installation failed: %s', message)
+        if self.finishedCallback:
+            self.finishedCallback(success, message)
+
 
 class DeveloperToolsForExtensionsTest(ScriptedLoadableModuleTest):
     """
@@ -276,6 +1515,15 @@ class DeveloperToolsForExtensionsTest(ScriptedLoadableModuleTest):
         self.test_PlatformCheck2()
         self.test_CheckFileExistsCaseSensitive1()
         self.test_CheckFileExistsCaseSensitive2()
+        self.test_findScriptedModules()
+        self.test_addModulesFromDirectory()
+        self.test_moduleLoadProfile()
+        self.test_moduleSearchPaths()
+        self.test_extensionDescriptions()
+        self.test_verifyExtensionArchive()
+        self.test_packageExtension()
+        self.test_commandLineValidateOnly()
+        self.test_moduleImportTime()
         # To be debugged->Uninstall function seems to create issues with Python when restarting Slicer
 #        self.test_installExtension()
 
@@ -370,60 +1618,377 @@ class DeveloperToolsForExtensionsTest(ScriptedLoadableModuleTest):
         self.assertTrue(logic.CheckFileExistsCaseSensitive(slicerPath))
         self.delayDisplay(testName+': Test passed!')
 
+    def test_findScriptedModules(self):
+        """Checks that scripted modules are found in a directory tree with their dependencies,
+        and that they are sorted in dependency order.
+        """
+        testName = "findScriptedModules"
+        self.delayDisplay("Starting the test: "+testName)
+        import shutil
+        import tempfile
+        logic = DeveloperToolsForExtensionsLogic()
+        moduleTemplate = """
+from slicer.ScriptedLoadableModule import *
+class {name}(ScriptedLoadableModule):
+    def __init__(self, parent):
+        ScriptedLoadableModule.__init__(self, parent)
+        self.parent.dependencies = {dependencies}
+"""
+        directory = tempfile.mkdtemp(dir=slicer.app.temporaryPath)
+        try:
+            os.makedirs(os.path.join(directory, "Sub"))
+            for subdirectory, name, dependencies in [("", "ModuleA", ["ModuleB", "Markups"]),
+                                                     ("Sub", "ModuleB", ["ModuleC"]),
+                                                     ("", "ModuleC", [])]:
+                with open(os.path.join(directory, subdirectory, name+".py"), "w") as f:
+                    f.write(moduleTemplate.format(name=name, dependencies=repr(dependencies)))
+            with open(os.path.join(directory, "Helper.py"), "w") as f:
+                f.write("import ScriptedLoadableModule\n")
+            modules = logic.findScriptedModules(directory)
+            self.assertEqual(sorted(modules.keys()), ["ModuleA", "ModuleB", "ModuleC"])
+            self.assertEqual(modules["ModuleA"]['dependencies'], ["ModuleB", "Markups"])
+            dependencies = {name: modules[name]['dependencies'] for name in modules}
+            self.assertEqual(logic.sortByDependencies(dependencies), ["ModuleC", "ModuleB", "ModuleA"])
+            dependencies["ModuleC"] = ["ModuleA"]
+            with self.assertRaises(Exception):
+                logic.sortByDependencies(dependencies)
+        finally:
+            shutil.rmtree(directory)
+        self.delayDisplay(testName+': Test passed!')
+
+    def test_addModulesFromDirectory(self):
+        """Checks that all modules of a directory are loaded, and that loading the directory again
+        reports the modules that are already loaded instead of failing.
+        """
+        testName = "addModulesFromDirectory"
+        self.delayDisplay("Starting the test: "+testName)
+        import tempfile
+        logic = DeveloperToolsForExtensionsLogic()
+        # Directory is not removed, as loaded modules keep referring to their source files
+        directory = tempfile.mkdtemp(dir=slicer.app.temporaryPath)
+        # Module names must be unique in the application session
+        moduleNames = ["AddModulesTest%s%d" % (name, int(time.time() * 1000)) for name in ["A", "B"]]
+        for moduleName in moduleNames:
+            with open(os.path.join(directory, moduleName + ".py"), "w") as f:
+                f.write("from slicer.ScriptedLoadableModule import *\n"
+                        "class %s(ScriptedLoadableModule):\n"
+                        "    def __init__(self, parent):\n"
+                        "        ScriptedLoadableModule.__init__(self, parent)\n"
+                        "        self.parent.hidden = True\n" % moduleName)
+        result = logic.addModulesFromDirectory(directory, False)
+        self.assertEqual([(module['name'], module['loaded'], module['error']) for module in result['modules']],
+                         [(moduleName, True, None) for moduleName in moduleNames])
+        result = logic.addModulesFromDirectory(directory, False)
+        self.assertEqual([(module['name'], module['loaded'], module['error']) for module in result['modules']],
+                         [(moduleName, False, 'Module already loaded') for moduleName in moduleNames])
+        self.delayDisplay(testName+': Test passed!')
+
+    def test_moduleLoadProfile(self):
+        """Checks that module load phases and call statistics are recorded and reported in a table.
+        """
+        testName = "moduleLoadProfile"
+        self.delayDisplay("Starting the test: "+testName)
+        import tempfile
+        logic = DeveloperToolsForExtensionsLogic()
+        import time
+        with tempfile.NamedTemporaryFile("w", suffix=".py", dir=slicer.app.temporaryPath, delete=False) as f:
+            # The module must not be run in this process
+            f.write("import time\ntime.sleep(0.05)\nimport slicer\nslicer.moduleLoadProfileTestImported = True\n")
+            fileName = f.name
+        try:
+            moduleProfile = logic._startModuleProfile("SlowModule", fileName, True)
+            logic._profilePhase(moduleProfile, 'instantiate', time.sleep, 0.05)
+            logic._profileIsolatedImport(moduleProfile)
+            logic._finishModuleProfile(moduleProfile)
+            # Failed measurement is recorded
+            failedProfile = logic._startModuleProfile("MissingModule", fileName + ".missing.py", False)
+            logic._profileIsolatedImport(failedProfile)
+            logic._finishModuleProfile(failedProfile)
+        finally:
+            os.remove(fileName)
+        self.assertEqual(logic.moduleLoadProfiles, [moduleProfile, failedProfile])
+        self.assertIsNone(failedProfile['isolatedImport'])
+        self.assertTrue(failedProfile['isolatedImportError'])
+        self.assertTrue(moduleProfile['instantiate'] >= 0.05)
+        self.assertTrue(moduleProfile['isolatedImport'] >= 0.05)
+        self.assertFalse(hasattr(slicer, 'moduleLoadProfileTestImported'))
+        self.assertIsNone(moduleProfile['register'])
+        self.assertIn("sleep", moduleProfile['callStats'])
+        # Waiting for the separate process is not in the call statistics
+        self.assertNotIn("subprocess", moduleProfile['callStats'])
+        tableNode = slicer.vtkMRMLTableNode()
+        logic.getModuleLoadProfilesAsTable(tableNode)
+        self.assertEqual(tableNode.GetNumberOfRows(), 2)
+        self.assertEqual(tableNode.GetNumberOfColumns(), 3 + len(logic.moduleLoadPhases))
+        self.delayDisplay(testName+': Test passed!')
+
+    def test_moduleSearchPaths(self):
+        """Checks that module search paths are deduplicated, pruned and measured.
+        The original search paths are restored at the end of the test.
+        """
+        testName = "moduleSearchPaths"
+        self.delayDisplay("Starting the test: "+testName)
+        import shutil
+        import tempfile
+        logic = DeveloperToolsForExtensionsLogic()
+        originalSearchPaths = logic.getModuleSearchPaths()
+        directory = tempfile.mkdtemp(dir=slicer.app.temporaryPath)
+        try:
+            for fileName in ["ModuleA.py", "ModuleB.py", "README.txt"]:
+                open(os.path.join(directory, fileName), "w").close()
+            missingDirectory = os.path.join(directory, "doesNotExist")
+            logic.setModuleSearchPaths([])
+            self.assertEqual(logic.addModuleSearchPaths([directory, directory + "/", missingDirectory]),
+                             [directory, missingDirectory])
+            # Bypass deduplication to simulate a setting written by another tool
+            logic.setModuleSearchPaths(logic.getModuleSearchPaths() + [directory + "/."])
+            measurements = logic.measureModuleSearchPaths()
+            self.assertEqual([(m['exists'], m['duplicate']) for m in measurements],
+                             [(True, False), (False, False), (True, True)])
+            self.assertEqual(measurements[0]['fileCount'], 3)
+            self.assertEqual(measurements[0]['moduleFileCount'], 2)
+            self.assertEqual(logic.cleanModuleSearchPaths(),
+                             {'duplicate': [directory + "/."], 'missing': [missingDirectory]})
+            self.assertEqual(logic.getModuleSearchPaths(), [directory])
+            self.assertEqual(logic.removeModuleSearchPaths([directory + "/"]), [directory])
+            self.assertEqual(logic.getModuleSearchPaths(), [])
+        finally:
+            logic.setModuleSearchPaths(originalSearchPaths)
+            shutil.rmtree(directory)
+        self.delayDisplay(testName+': Test passed!')
+
+    def test_extensionDescriptions(self):
+        """Checks that extension description files are parsed, cached, and sorted in dependency order.
+        """
+        testName = "extensionDescriptions"
+        self.delayDisplay("Starting the test: "+testName)
+        import shutil
+        import tempfile
+        logic = DeveloperToolsForExtensionsLogic()
+        currentFilePath = os.path.dirname(os.path.realpath(__file__))
+        dummyDescriptionFile = os.path.join(currentFilePath, "Testing", "Python", "myDummyExtension.s4ext")
+        description = logic.readExtensionDescription(dummyDescriptionFile)
+        self.assertEqual(description['scmurl'], "/JohnDoeDoesntExist/myDummyExtension")
+        self.assertEqual(description['category'], "Developer Tools")
+        self.assertEqual(description['homepage'], "")
+        self.assertEqual(logic.getExtensionDependencies(description), [])
+        self.assertIs(logic.readExtensionDescription(dummyDescriptionFile), description)
+
+        directory = tempfile.mkdtemp(dir=slicer.app.temporaryPath)
+        try:
+            fileNames = []
+            for name, depends in [("ExtA", "ExtB ExtC"), ("ExtB", "ExtC"), ("ExtC", "NA"), ("ExtD", "ExtMissing")]:
+                fileNames.append(os.path.join(directory, name+".s4ext"))
+                with open(fileNames[-1], "w") as f:
+                    f.write("# comment\nscm git\ndepends %s\n" % depends)
+            descriptions = logic.readExtensionDescriptions(fileNames)
+            self.assertEqual(sorted(descriptions.keys()), ["ExtA", "ExtB", "ExtC", "ExtD"])
+            self.assertEqual(logic.getExtensionInstallOrder(descriptions), ["ExtC", "ExtD", "ExtB", "ExtA"])
+            self.assertEqual(logic.getMissingExtensionDependencies(descriptions), {"ExtD": ["ExtMissing"]})
+            descriptions["ExtC"] = {'depends': "ExtA"}
+            with self.assertRaises(Exception) as cm:
+                logic.getExtensionInstallOrder(descriptions)
+            self.assertIn("ExtA -> ExtB -> ExtC -> ExtA", str(cm.exception))
+            os.makedirs(os.path.join(directory, "other"))
+            otherFileName = os.path.join(directory, "other", "ExtA.s4ext")
+            with open(otherFileName, "w") as f:
+                f.write("depends NA\n")
+            with self.assertRaises(Exception):
+                logic.readExtensionDescriptions(fileNames + [otherFileName])
+        finally:
+            shutil.rmtree(directory)
+        self.delayDisplay(testName+': Test passed!')
+
+    def test_verifyExtensionArchive(self):
+        """Checks that an extension archive is hashed and verified, that a member path outside of the
+        extension directory is detected, and that verification can be cancelled.
+        """
+        testName = "verifyExtensionArchive"
+        self.delayDisplay("Starting the test: "+testName)
+        import hashlib
+        import shutil
+        import tarfile
+        import tempfile
+        import threading
+        logic = DeveloperToolsForExtensionsLogic()
+        directory = tempfile.mkdtemp(dir=slicer.app.temporaryPath)
+        try:
+            extensionDirectory = os.path.join(directory, "input", "share", "Slicer-5.8")
+            os.makedirs(extensionDirectory)
+            currentFilePath = os.path.dirname(os.path.realpath(__file__))
+            shutil.copyfile(os.path.join(currentFilePath, "Testing", "Python", "myDummyExtension.s4ext"),
+                            os.path.join(extensionDirectory, "myDummyExtension.s4ext"))
+            with open(os.path.join(extensionDirectory, "tool"), "w") as f:
+                f.write("#!/bin/sh\n" * 1000)
+            os.chmod(os.path.join(extensionDirectory, "tool"), 0o755)
+            archiveFileName = os.path.join(directory, "12345-linux-amd64-myDummyExtension-git123-2025-01-01.tar.gz")
+            with tarfile.open(archiveFileName, "w:gz") as archive:
+                archive.add(os.path.join(directory, "input"), "12345-linux-amd64-myDummyExtension")
+            with open(archiveFileName, "rb") as f:
+                expectedSha256 = hashlib.sha256(f.read()).hexdigest()
+
+            stages = []
+            result = logic.verifyExtensionArchive(archiveFileName, expectedSha256,
+                                                  lambda stage, progress: stages.append(stage))
+            self.assertEqual(result['sha256'], expectedSha256)
+            self.assertEqual(stages[0], 'hash')
+            self.assertEqual(stages[-1], 'verify')
+            # Hash is only computed if it is checked
+            self.assertIsNone(logic.verifyExtensionArchive(archiveFileName)['sha256'])
+
+            with self.assertRaises(Exception):
+                logic.verifyExtensionArchive(archiveFileName, "0" * 64)
+            cancelEvent = threading.Event()
+            cancelEvent.set()
+            with self.assertRaises(Exception) as cm:
+                logic.verifyExtensionArchive(archiveFileName, cancelEvent=cancelEvent)
+            self.assertEqual(str(cm.exception), "Extension installation cancelled")
+
+            # Member outside of the extension directory
+            import zipfile
+            invalidArchiveFileName = os.path.join(directory, "12345-linux-amd64-myDummyExtension.zip")
+            with zipfile.ZipFile(invalidArchiveFileName, "w") as archive:
+                archive.writestr("12345-linux-amd64-myDummyExtension/myDummyExtension.s4ext", "")
+                archive.writestr("12345-linux-amd64-myDummyExtension/../../tool", "")
+            with self.assertRaises(Exception):
+                logic.verifyExtensionArchive(invalidArchiveFileName)
+        finally:
+            shutil.rmtree(directory)
+        self.delayDisplay(testName+': Test passed!')
+
+    def test_moduleImportTime(self):
+        """Guards the module contribution to application startup time: loading the module must not
+        import the modules that are only needed by specific actions. The module is imported in a separate
+        process, so that modules already imported in this application are detected too.
+        """
+        testName = "moduleImportTime"
+        self.delayDisplay("Starting the test: "+testName)
+        moduleImport = DeveloperToolsForExtensionsLogic().measureModuleImport(os.path.realpath(__file__))
+        logging.info("DeveloperToolsForExtensions module import time: %.1f ms", moduleImport['importTime'] * 1000.0)
+        importedPackages = set(name.split('.')[0] for name in moduleImport['importedModules'])
+        for heavyModuleName in ['concurrent', 'tarfile', 'zipfile', 'hashlib', 'cProfile', 'pstats']:
+            self.assertNotIn(heavyModuleName, importedPackages)
+        self.delayDisplay(testName+': Test passed!')
+
     def _install_dummy_extension(self, myExtensionName):
+        import shutil
+        import tempfile
         logic = DeveloperToolsForExtensionsLogic()
-        myCurrentOS = slicer.app.os
-        myCurrentArch = slicer.app.arch
-        myCurrentRev = slicer.app.repositoryRevision
-        # The only archive format we are sure we have is zip, through the python interface.
-        # Since this format works on the 3 platforms we support (Windows, MacOS, and linux),
-        # we use this format instead of 'tar.gz' on linux and MacOS.
-        extenstion = ".zip"
-        myExtensionFileRootName = "-".join([myCurrentRev, myCurrentOS, myCurrentArch, myExtensionName])
         tempPath = slicer.app.temporaryPath
         currentFilePath = os.path.dirname(os.path.realpath(__file__))
         inputDescriptionFile = os.path.join(currentFilePath, "Testing", "Python", "myDummyExtension.s4ext")
-        myCurrentOS = slicer.app.os
-        myCurrentVersion = slicer.app.applicationVersion
-        versionNoDate = myCurrentVersion.split("-")  # Get version number without date
-        versionSplit = versionNoDate[0].split(".")  # Split major.minor.patch
-        # Create a variable containing a string of the form "Slicer-4.4"
-        slicerVersionDirectory = "Slicer-"+versionSplit[0]+"."+versionSplit[1]
-        if myCurrentOS == "macosx":
-            internalPackagePath = os.path.join(myExtensionFileRootName,
-                                               "Slicer.app", "Contents",
-                                               "Extensions-"+myCurrentRev, myExtensionName,
-                                               "share", slicerVersionDirectory)
-        else:  # "win" or linux
-            internalPackagePath = os.path.join(myExtensionFileRootName,"share", slicerVersionDirectory)
-        import errno
-        try:
-            pathToCreate = os.path.join(tempPath, internalPackagePath)
-            logging.info("Directory to create for test extension: "+pathToCreate)
-            os.makedirs(pathToCreate)
-        except OSError as exception:
-            if exception.errno != errno.EEXIST:  # We report error except if it is because directory already exists
-                logging.critical("Error while creating extension directory in temp folder")
-                return False
-            logging.info("Extension directory already exists")
+        installTreeDirectory = tempfile.mkdtemp(dir=tempPath)
         try:
-            import shutil
-            outputDescriptionFile = os.path.join(pathToCreate, myExtensionName+".s4ext")
-            shutil.copyfile(inputDescriptionFile, outputDescriptionFile)
-            myExtensionFileName = myExtensionFileRootName+extenstion
-            myExtensionInputDirectory = os.path.join(tempPath, myExtensionFileRootName)
-            outputExtensionFileName = os.path.join(tempPath, myExtensionFileName)
+            descriptionDirectory = os.path.join(installTreeDirectory, "share", logic.getSlicerVersionDirectory())
+            os.makedirs(descriptionDirectory)
+            shutil.copyfile(inputDescriptionFile, os.path.join(descriptionDirectory, myExtensionName+".s4ext"))
+            outputExtensionFileName = logic.packageExtension(installTreeDirectory, tempPath)
             logging.info("Output zipped file name:"+outputExtensionFileName)
-            logging.info("Directory to zip:"+myExtensionInputDirectory)
-            slicer.vtkMRMLApplicationLogic().Zip(outputExtensionFileName, myExtensionInputDirectory)
         except Exception as exception:
             logging.critical(exception)
             return False
+        finally:
+            shutil.rmtree(installTreeDirectory)
         if logic.installExtension(outputExtensionFileName):
             slicer.app.extensionsManagerModel().scheduleExtensionForUninstall(myExtensionName)
             return True
         return False
 
+    def test_packageExtension(self):
+        """Checks that extension archives are created with the platform layout, and that
+        packaging the same install tree twice gives byte-identical archives.
+        """
+        testName = "packageExtension"
+        self.delayDisplay("Starting the test: "+testName)
+        import filecmp
+        import shutil
+        import tempfile
+        import zipfile
+        logic = DeveloperToolsForExtensionsLogic()
+        directory = tempfile.mkdtemp(dir=slicer.app.temporaryPath)
+        try:
+            installTreeDirectory = os.path.join(directory, "install")
+            descriptionDirectory = os.path.join(installTreeDirectory, "share", logic.getSlicerVersionDirectory())
+            libDirectory = os.path.join(installTreeDirectory, "lib", logic.getSlicerVersionDirectory())
+            os.makedirs(descriptionDirectory)
+            os.makedirs(libDirectory)
+            with open(os.path.join(descriptionDirectory, "myPackagedExtension.s4ext"), "w") as f:
+                f.write("depends NA\n")
+            for index in range(20):
+                with open(os.path.join(libDirectory, "file%d.txt" % index), "w") as f:
+                    f.write("content %d\n" % index * 1000)
+            outputDirectories = [os.path.join(directory, "output1"), os.path.join(directory, "output2")]
+            archiveFileNames = []
+            for outputDirectory, numberOfThreads in zip(outputDirectories, [1, 4]):
+                os.makedirs(outputDirectory)
+                archiveFileNames.append(logic.packageExtension(installTreeDirectory, outputDirectory,
+                                                               numberOfThreads=numberOfThreads))
+            self.assertTrue(filecmp.cmp(archiveFileNames[0], archiveFileNames[1], shallow=False))
+            rootName, installTreePath = logic.getExtensionArchiveLayout("myPackagedExtension")
+            self.assertEqual(os.path.basename(archiveFileNames[0]), rootName + ".zip")
+            with zipfile.ZipFile(archiveFileNames[0]) as archive:
+                self.assertIsNone(archive.testzip())
+                descriptionName = "/".join([installTreePath, "share", logic.getSlicerVersionDirectory(),
+                                            "myPackagedExtension.s4ext"])
+                self.assertEqual(archive.read(descriptionName), b"depends NA\n")
+        finally:
+            shutil.rmtree(directory)
+        self.delayDisplay(testName+': Test passed!')
+
+    def test_commandLineValidateOnly(self):
+        """Checks the command line report and exit code in validate-only mode, with valid, invalid
+        and duplicate extension archives, and that nothing is packaged.
+        """
+        testName = "commandLineValidateOnly"
+        self.delayDisplay("Starting the test: "+testName)
+        import json
+        import shutil
+        import tempfile
+        logic = DeveloperToolsForExtensionsLogic()
+        directory = tempfile.mkdtemp(dir=slicer.app.temporaryPath)
+        try:
+            installTreeDirectory = os.path.join(directory, "install")
+            descriptionDirectory = os.path.join(installTreeDirectory, "share", logic.getSlicerVersionDirectory())
+            os.makedirs(descriptionDirectory)
+            with open(os.path.join(descriptionDirectory, "myCommandLineExtension.s4ext"), "w") as f:
+                f.write("depends NA\n")
+            archiveFileNames = []
+            for outputDirectory in ["archives1", "archives2"]:
+                os.makedirs(os.path.join(directory, outputDirectory))
+                archiveFileNames.append(logic.packageExtension(installTreeDirectory, os.path.join(directory, outputDirectory)))
+            packageOutputDirectory = os.path.join(directory, "packages")
+            os.makedirs(packageOutputDirectory)
+            jsonFileName = os.path.join(directory, "report.json")
+
+            def runMain(argv):
+                with self.assertRaises(SystemExit) as cm:
+                    main(argv + ["--validate-only", "--output-json", jsonFileName])
+                with open(jsonFileName) as jsonFile:
+                    return cm.exception.code, json.load(jsonFile)
+
+            exitCode, report = runMain(["--install", archiveFileNames[0], "--package", installTreeDirectory,
+                                        "--package-output", packageOutputDirectory])
+            self.assertEqual(exitCode, 0)
+            self.assertTrue(report['success'])
+            self.assertEqual(report['extensions'][0]['name'], "myCommandLineExtension")
+            self.assertFalse(report['extensions'][0]['installed'])
+            self.assertEqual(os.listdir(packageOutputDirectory), [])
+
+            exitCode, report = runMain(["--install", archiveFileNames[0],
+                                        "--install", os.path.join(directory, "missing.zip")])
+            self.assertEqual(exitCode, 1)
+            self.assertFalse(report['success'])
+            self.assertEqual([result['valid'] for result in report['extensions']], [True, False])
+            self.assertTrue(report['extensions'][1]['error'])
+
+            exitCode, report = runMain(["--install", archiveFileNames[0], "--install", archiveFileNames[1]])
+            self.assertEqual(exitCode, 1)
+            self.assertEqual([result['valid'] for result in report['extensions']], [True, False])
+            self.assertIn("Duplicate extension name", report['extensions'][1]['error'])
+        finally:
+            shutil.rmtree(directory)
+        self.delayDisplay(testName+': Test passed!')
+
     def test_installExtension(self):
         """ Downloads and install a fake package. After the installation, is schedule the extension for uninstall
         as it cannot uninstall it right away.
@@ -439,4 +2004,160 @@ class DeveloperToolsForExtensionsTest(ScriptedLoadableModuleTest):
             return
         self.delayDisplay("Starting the test: "+testName)
 #        self.assertTrue(self._install_dummy_extension(myTestExtension))
-        self.delayDisplay(testName+': Test passed!')
\ No newline at end of file
+        self.delayDisplay(testName+': Test passed!')
+
+
+def main(argv):
+    import argparse, json
+
+    parser = argparse.ArgumentParser(description="Slicer extension archive installation and module loading tool")
+    parser.add_argument('-i', '--install', dest="archives", action='append', default=[],
+                        help="Extension archive to install. Can be specified multiple times.")
+    parser.add_argument('-m', '--load-module', dest="moduleFiles", action='append', default=[],
+                        help="Scripted module file to load. Can be specified multiple times.")
+    parser.add_argument('-d', '--load-modules-from', dest="moduleDirectories", action='append', default=[],
+                        help="Directory to load all scripted modules from. Can be specified multiple times.")
+    parser.add_argument('-b', '--batch', dest="batchFiles", action='append', default=[],
+                        help="Text file listing extension archives, module files and module directories"
+                             " (one per line, lines starting with # are ignored).")
+    parser.add_argument('--package', dest="installTrees", action='append', default=[],
+                        help="Extension install tree to package into an extension archive. Can be specified multiple times.")
+    parser.add_argument('--package-output', dest="packageOutputDirectory", default=".",
+                        help="Directory where extension archives are created (default: current directory).")
+    parser.add_argument('-p', '--permanent', dest="permanent", action='store_true',
+                        help="Add loaded module paths to the permanent module search paths.")
+    parser.add_argument('--validate-only', dest="validateOnly", action='store_true',
+                        help="Only validate the inputs, do not install or load anything.")
+    parser.add_argument('-j', '--output-json', dest="jsonName", required=False,
+                        help="Name of the output JSON file to store the results. Printed on standard output if not specified.")
+
+    args = parser.parse_args(argv)
+
+    archives = list(args.archives)
+    moduleFiles = list(args.moduleFiles)
+    moduleDirectories = list(args.moduleDirectories)
+    for batchFile in args.batchFiles:
+        with open(batchFile, 'r') as f:
+            for line in f:
+                path = line.strip()
+                if not path or path.startswith('#'):
+                    continue
+                if os.path.isdir(path):
+                    moduleDirectories.append(path)
+                elif path.endswith('.py'):
+                    moduleFiles.append(path)
+                else:
+                    archives.append(path)
+    if not (archives or moduleFiles or moduleDirectories or args.installTrees):
+        parser.error("No extension archive, install tree, module or module directory specified")
+
+    logic = DeveloperToolsForExtensionsLogic()
+    report = {'packages': [], 'extensions': [], 'modules': [], 'restartRequired': False}
+
+    # Extension packaging (install trees are only checked in validate-only mode, nothing is written)
+    for installTree in args.installTrees:
+        result = {'directory': installTree, 'file': None, 'error': None}
+        report['packages'].append(result)
+        if args.validateOnly:
+            if not os.path.isdir(installTree):
+                result['error'] = "Directory does not exist: %s" % installTree
+            continue
+        try:
+            result['file'] = logic.packageExtension(installTree, args.packageOutputDirectory)
+        except Exception as e:
+            result['error'] = str(e)
+
+    # Extension archives
+    extensionResults = {}
+    extensionDescriptions = {}
+    for archive in archives:
+        result = {'file': archive, 'name': None, 'valid': False, 'installed': False, 'error': None}
+        report['extensions'].append(result)
+        try:
+            result['name'], description = logic.validateExtensionArchive(archive)
+            if result['name'] in extensionResults:
+                raise Exception("Duplicate extension name %s (also in %s)"
+                                % (result['name'], extensionResults[result['name']]['file']))
+            result['valid'] = True
+            extensionResults[result['name']] = result
+            extensionDescriptions[result['name']] = description
+        except Exception as e:
+            result['error'] = str(e)
+    if not args.validateOnly and extensionDescriptions:
+        try:
+            installOrder = logic.getExtensionInstallOrder(extensionDescriptions)
+        except Exception as e:
+            installOrder = []
+            for result in extensionResults.values():
+                result['error'] = str(e)
+        for extensionName in installOrder:
+            result = extensionResults[extensionName]
+            try:
+                result['installed'] = bool(logic.installExtension(result['file']))
+                if not result['installed']:
+                    result['error'] = 'Extension installation failed'
+            except Exception as e:
+                result['error'] = str(e)
+        report['restartRequired'] = any(result['installed'] for result in report['extensions'])
+
+    # Scripted modules
+    modules = {}
+    for moduleFile in moduleFiles:
+        result = {'file': moduleFile, 'name': os.path.splitext(os.path.basename(moduleFile))[0],
+                  'valid': False, 'loaded': False, 'error': None}
+        report['modules'].append(result)
+        dependencies = logic._readScriptedModuleDependencies(moduleFile) if os.path.isfile(moduleFile) else None
+        if dependencies is None:
+            result['error'] = 'Not a scripted module file'
+            continue
+        result['valid'] = True
+        modules[result['name']] = {'fileName': moduleFile, 'dependencies': dependencies}
+    for moduleDirectory in moduleDirectories:
+        try:
+            directoryModules = logic.findScriptedModules(moduleDirectory)
+        except Exception as e:
+            report['modules'].append({'file': moduleDirectory, 'name': None,
+                                      'valid': False, 'loaded': False, 'error': str(e)})
+            continue
+        for name in directoryModules:
+            report['modules'].append({'file': directoryModules[name]['fileName'], 'name': name,
+                                      'valid': True, 'loaded': False, 'error': None})
+        modules.update(directoryModules)
+    if not args.validateOnly and modules:
+        moduleResults = dict((result['name'], result) for result in report['modules'] if result['valid'])
+        try:
+            sortedNames = logic.sortByDependencies(dict((name, modules[name]['dependencies']) for name in modules))
+            loadResult = logic.addModules([modules[name]['fileName'] for name in sortedNames], args.permanent)
+            report['loadTime'] = loadResult['loadTime']
+            for moduleResult in loadResult['modules']:
+                result = moduleResults[moduleResult['name']]
+                result['loaded'] = moduleResult['loaded']
+                result['registerTime'] = moduleResult['registerTime']
+                result['error'] = moduleResult['error']
+        except Exception as e:
+            for result in moduleResults.values():
+                result['error'] = str(e)
+
+    if args.validateOnly:
+        success = all(result['valid'] for result in report['extensions'] + report['modules'])
+    else:
+        success = all(result['installed'] for result in report['extensions']) and \
+                  all(result['loaded'] for result in report['modules'])
+    if args.validateOnly:
+        success = success and not any(result['error'] for result in report['packages'])
+    else:
+        success = success and all(result['file'] for result in report['packages'])
+    report['success'] = success
+
+    jsonReport = json.dumps(report, indent=2)
+    if args.jsonName:
+        with open(args.jsonName, 'w') as jsonFile:
+            jsonFile.write(jsonReport)
+    else:
+        print(jsonReport)
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -3,10 +3,10 @@ from slicer.ScriptedLoadableModule import *
 from slicer.i18n import tr as _
 from slicer.i18n import translate
 
-import json
+import array
+import collections
 import logging
 import os
-import requests
 import sys
 import time
 
@@ -47,7 +47,11 @@ class ExtensionStatsWidget(ScriptedLoadableModuleWidget):
   def setup(self):
     ScriptedLoadableModuleWidget.setup(self)
 
-    self.logic = ExtensionStatsLogic()
+    # Logic, settings and table node are only needed when the user requests statistics,
+    # they are created on first use to keep module setup fast.
+    self.logic = None
+    self.statsTableNode = None
+    self.extensionNamesRestored = False
 
     # Instantiate and connect widgets ...
 
@@ -63,8 +67,6 @@ class ExtensionStatsWidget(ScriptedLoadableModuleWidget):
     extensionNameBox = qt.QHBoxLayout()
 
     self.extensionNameEdit = qt.QLineEdit()
-    # Developers usually have a list of extensions that they are interested in, remember that in application settings
-    self.extensionNameEdit.setText(qt.QSettings().value('ExtensionStats/ExtensionNames', ''))
     self.extensionNameEdit.toolTip = _("Comma-separated list of extension to collect download statistics for. If not specified then all extensions will be listed.")
     extensionNameBox.addWidget(self.extensionNameEdit)
 
@@ -85,6 +87,20 @@ class ExtensionStatsWidget(ScriptedLoadableModuleWidget):
         )
     parametersFormLayout.addRow(self.dailyDownloadsButton)
 
+    analysisBox = qt.QHBoxLayout()
+    self.analysisModeSelector = qt.QComboBox()
+    self.analysisModeSelector.addItem(_("Share of release downloads"), "share")
+    self.analysisModeSelector.addItem(_("Growth since previous release"), "growth")
+    self.analysisModeSelector.addItem(_("Rank"), "rank")
+    self.analysisModeSelector.addItem(_("Rank change since previous release"), "rankChange")
+    self.analysisModeSelector.addItem(_("Anomalies (+1: spike, -1: collapse)"), "anomaly")
+    self.analysisModeSelector.toolTip = _("Release-over-release analysis of downloads (release and post-release downloads are merged)")
+    analysisBox.addWidget(self.analysisModeSelector)
+    self.analysisButton = qt.QPushButton(_("Get analysis"))
+    self.analysisButton.toolTip = _("Compute the selected analysis for each extension and release")
+    analysisBox.addWidget(self.analysisButton)
+    parametersFormLayout.addRow(_("Trends: "), analysisBox)
+
     # Stats table
     self.statsTableWidget = slicer.qMRMLTableView()
     self.statsTableWidget.setMRMLScene(slicer.mrmlScene)
@@ -95,13 +111,6 @@ class ExtensionStatsWidget(ScriptedLoadableModuleWidget):
     policy.setVerticalPolicy(qt.QSizePolicy.Expanding)
     self.statsTableWidget.setSizePolicy(policy)
 
-    self.statsTableNode = slicer.vtkMRMLTableNode()
-    self.statsTableNode.SetName(_('ExtensionStats'))
-    self.statsTableNode.SetUseColumnTitleAsColumnHeader(True)
-    self.statsTableNode.SetUseFirstColumnAsRowHeader(True)
-    slicer.mrmlScene.AddNode(self.statsTableNode)
-    self.statsTableWidget.setMRMLTableNode(self.statsTableNode)
-
     # Copy to clipboard button
     self.copyToClipboardButton = qt.QPushButton(_("Copy table to clipboard"))
     parametersFormLayout.addRow('', self.copyToClipboardButton)
@@ -110,16 +119,41 @@ class ExtensionStatsWidget(ScriptedLoadableModuleWidget):
     self.extensionNameAllButton.connect('clicked()', self.populateExtensionNameEdit)
     self.totalDownloadsButton.connect('clicked(bool)', self.onTotalDownloadsButton)
     self.dailyDownloadsButton.connect('clicked(bool)', self.onDailyDownloadsButton)
+    self.analysisButton.connect('clicked(bool)', self.onAnalysisButton)
     self.copyToClipboardButton.connect('clicked()', self.copyTableToClipboard)
 
     # Add vertical spacer
     #self.layout.addStretch(1)
 
+  def enter(self):
+    self._restoreExtensionNames()
+
+  def _restoreExtensionNames(self):
+    if not self.extensionNamesRestored:
+      # Developers usually have a list of extensions that they are interested in, remember that in application settings
+      self.extensionNameEdit.setText(qt.QSettings().value('ExtensionStats/ExtensionNames', ''))
+      self.extensionNamesRestored = True
+
   def cleanup(self):
     pass
 
+  def getLogic(self):
+    if not self.logic:
+      self.logic = ExtensionStatsLogic()
+    return self.logic
+
+  def getStatsTableNode(self):
+    if not self.statsTableNode or not self.statsTableNode.GetScene():
+      self.statsTableNode = slicer.vtkMRMLTableNode()
+      self.statsTableNode.SetName(_('ExtensionStats'))
+      self.statsTableNode.SetUseColumnTitleAsColumnHeader(True)
+      self.statsTableNode.SetUseFirstColumnAsRowHeader(True)
+      slicer.mrmlScene.AddNode(self.statsTableNode)
+      self.statsTableWidget.setMRMLTableNode(self.statsTableNode)
+    return self.statsTableNode
+
   def populateExtensionNameEdit(self):
-    extensionsList = self.logic.getExtensionNames()
+    extensionsList = self.getLogic().getExtensionNames()
     extensionsList.sort()
     extensionNames = ",".join(extensionsList)
     self.extensionNameEdit.setText(extensionNames)
@@ -134,17 +168,29 @@ class ExtensionStatsWidget(ScriptedLoadableModuleWidget):
 
   def onTotalDownloadsButton(self):
     # Save last extension list
+    self._restoreExtensionNames()
     qt.QSettings().setValue('ExtensionStats/ExtensionNames', self.extensionNameEdit.text)
     with slicer.util.tryWithErrorDisplay(_("Unexpected error."), waitCursor=True):
-      self.logic.getExtensionDownloadStatsAsTable(self.statsTableNode, self._selectedExtensionNames(), mode="total")
+      self.getLogic().getExtensionDownloadStatsAsTable(self.getStatsTableNode(), self._selectedExtensionNames(), mode="total")
 
   def onDailyDownloadsButton(self):
     # Save last extension list
+    self._restoreExtensionNames()
+    qt.QSettings().setValue('ExtensionStats/ExtensionNames', self.extensionNameEdit.text)
+    with slicer.util.tryWithErrorDisplay(_("Unexpected error."), waitCursor=True):
+      self.getLogic().getExtensionDownloadStatsAsTable(self.getStatsTableNode(), self._selectedExtensionNames(), mode="daily")
+
+  def onAnalysisButton(self):
+    # Save last extension list
+    self._restoreExtensionNames()
     qt.QSettings().setValue('ExtensionStats/ExtensionNames', self.extensionNameEdit.text)
+    mode = self.analysisModeSelector.currentData
     with slicer.util.tryWithErrorDisplay(_("Unexpected error."), waitCursor=True):
-      self.logic.getExtensionDownloadStatsAsTable(self.statsTableNode, self._selectedExtensionNames(), mode="daily")
+      self.getLogic().getExtensionDownloadStatsAsTable(self.getStatsTableNode(), self._selectedExtensionNames(), mode=mode)
 
   def copyTableToClipboard(self):
+    if not self.statsTableNode:
+      return
     table = self.statsTableNode.GetTable()
     tableText = ''
 
@@ -161,6 +207,21 @@ class ExtensionStatsWidget(ScriptedLoadableModuleWidget):
         tableText += str(table.GetColumn(columnIndex).GetValue(rowIndex))
     qt.QApplication.clipboard().setText(tableText)
 
+#
+# ExtensionReleaseDownloads
+#
+
+class ExtensionReleaseDownloads:
+  """Download counts of an extension, stored in a fixed-length integer array
+  indexed by release id (see ExtensionStatsLogic.getSlicerReleaseNames).
+  """
+
+  __slots__ = ('extensionName', 'counts')
+
+  def __init__(self, extensionName, numberOfReleases):
+    self.extensionName = extensionName
+    self.counts = array.array('q', bytes(8 * numberOfReleases))
+
 #
 # ExtensionStatsLogic
 #
@@ -226,12 +287,120 @@ class ExtensionStatsLogic(ScriptedLoadableModuleLogic):
 
     self.legacyReleaseName = "legacy"
     self.unknownReleaseName = "unknown"
+    # Release names, release name to id map, and release revisions are computed on first use
+    self._releaseNames = None
+    self._releaseIds = None
+    self._releaseRevisions = None
     self.legacyReleaseDate = "2009-10-07"
 
     self.baselineExtensionDownloadStatsFile = os.path.dirname(slicer.modules.extensionstats.path) + "/Resources/ExtensionsDownloadStats-20211027.csv"
 
     self.downloadstatsUrl = "https://slicer-packages.kitware.com/api/v1/app/5f4474d0e1d8c75dfc705482/downloadstats"
-    self.downloadstats = None
+    # List of (source name, downloadstats URL). If None then only downloadstatsUrl is used.
+    self.downloadstatsSources = None
+    self.defaultSourceName = "slicer-packages"
+    self.baselineSourceName = "baseline"
+    self.downloadstatsTimeout = 120
+    # Payload of each source, set by fetchDownloadStats
+    self.downloadstatsBySource = {}
+    # Incremented each time a new download stats payload is set, used for invalidating cached results
+    self.downloadstatsVersion = 0
+    # Table modes computed by getExtensionDownloadAnalysis
+    self.analysisModes = ["share", "growth", "rank", "rankChange", "anomaly"]
+    self._downloadstats = None
+
+    # Cache of statistics tables, indexed by (extension names, mode, payload version)
+    self.statsTableCache = collections.OrderedDict()
+    self.statsTableCacheMaximumSize = 16
+    self.statsTableCacheHits = 0
+    self.statsTableCacheMisses = 0
+
+  @property
+  def downloadstats(self):
+    return self._downloadstats
+
+  @downloadstats.setter
+  def downloadstats(self, payload):
+    """Set download stats payload. It is attributed to the default source
+    (fetchDownloadStats sets the attribution of merged payloads)."""
+    self._downloadstats = payload
+    self.downloadstatsBySource = {self.defaultSourceName: payload} if payload is not None else {}
+    self.downloadstatsVersion += 1
+    self.clearStatsTableCache()
+
+  def clearStatsTableCache(self):
+    self.statsTableCache.clear()
+
+  def getDownloadStatsSources(self):
+    """Return list of (source name, downloadstats URL) of extension servers to get statistics from.
+    Raises ValueError if source names are not unique or a source uses the name of the baseline statistics.
+    """
+    if self.downloadstatsSources is None:
+      return [(self.defaultSourceName, self.downloadstatsUrl)]
+    sources = list(self.downloadstatsSources)
+    self.validateDownloadStatsSourceNames([name for name, url in sources])
+    return sources
+
+  def validateDownloadStatsSourceNames(self, names):
+    """Raise ValueError if source names are not unique or a source uses the name of the baseline statistics"""
+    if self.baselineSourceName in names:
+      raise ValueError(f"Source name '{self.baselineSourceName}' is reserved for baseline statistics")
+    duplicateNames = sorted(set(name for name in names if names.count(name) > 1))
+    if duplicateNames:
+      raise ValueError("Source names must be unique, duplicate names: " + ", ".join(duplicateNames))
+
+  def getDownloadStatsSourceNames(self):
+    """Return names of all statistics sources: baseline statistics and extension servers"""
+    return [self.baselineSourceName] + [name for name, url in self.getDownloadStatsSources()]
+
+  def _fetchDownloadStatsFromUrl(self, url):
+    import requests
+    resp = requests.get(url, timeout=self.downloadstatsTimeout)
+    resp.raise_for_status()
+    return resp.json()
+
+  def fetchDownloadStats(self):
+    """Get current extension download stats from Extensions Servers (Girder servers).
+    Sources are fetched concurrently and their payloads are merged.
+    """
+    downloadstats, downloadstatsBySource = self.fetchDownloadStatsFromSources(self.getDownloadStatsSources())
+    self.downloadstats = downloadstats
+    self.downloadstatsBySource = downloadstatsBySource
+
+  def fetchDownloadStatsFromSources(self, sources):
+    """Fetch download stats of the (source name, downloadstats URL) list concurrently.
+    Does not modify the logic, therefore it can be called from any thread.
+    Returns merged payload and payloads indexed by source name.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max(len(sources), 1)) as executor:
+      futures = [(name, executor.submit(self._fetchDownloadStatsFromUrl, url)) for name, url in sources]
+      downloadstatsBySource = {}
+      for name, future in futures:
+        try:
+          downloadstatsBySource[name] = future.result()
+        except Exception as e:
+          raise RuntimeError(f"Failed to get download stats from source {name}: {e}") from e
+    return self.mergeDownloadStats(list(downloadstatsBySource.values())), downloadstatsBySource
+
+  def mergeDownloadStats(self, payloads):
+    """Merge download stats payloads by summing download counts of the same revision, extension, OS and architecture"""
+    if len(payloads) == 1:
+      return payloads[0]
+    merged = {}
+    for payload in payloads:
+      for revision in payload:
+        mergedRevision = merged.setdefault(revision, {})
+        if 'extensions' not in payload[revision]:
+          continue
+        mergedExtensions = mergedRevision.setdefault('extensions', {})
+        for extensionName, platforms in payload[revision]['extensions'].items():
+          mergedPlatforms = mergedExtensions.setdefault(extensionName, {})
+          for platform, architectures in platforms.items():
+            mergedArchitectures = mergedPlatforms.setdefault(platform, {})
+            for architecture, downloadCount in architectures.items():
+              mergedArchitectures[architecture] = mergedArchitectures.get(architecture, 0) + downloadCount
+    return merged
 
   #---------------------------------------------------------------------------
   def getExtensionNames(self):
@@ -254,12 +423,42 @@ class ExtensionStatsLogic(ScriptedLoadableModuleLogic):
     """Return sorted list of release names.
     legacy: before any known release.
     unknown: invalid revision (not integer)
+    The index of a release in this list is its release id.
     """
-    releases = [self.unknownReleaseName, self.legacyReleaseName]
-    for releaseRevision in self.releases_revisionsDates:
-      releases.append(releaseRevision[0])
-      releases.append(self.postReleasePrefix + releaseRevision[0])
-    return releases
+    return list(self._getReleaseNames())
+
+  def _getReleaseNames(self):
+    """Return the shared (interned) list of release names, see getSlicerReleaseNames"""
+    if self._releaseNames is None:
+      releases = [self.unknownReleaseName, self.legacyReleaseName]
+      for releaseRevision in self.releases_revisionsDates:
+        releases.append(releaseRevision[0])
+        releases.append(self.postReleasePrefix + releaseRevision[0])
+      self._releaseNames = releases
+      self._releaseIds = {release: releaseId for releaseId, release in enumerate(releases)}
+      self._releaseRevisions = [int(revision_date[0]) for release, revision_date in self.releases_revisionsDates]
+    return self._releaseNames
+
+  #---------------------------------------------------------------------------
+  def getSlicerReleaseId(self, revision):
+    """Return the id (index in getSlicerReleaseNames) of the Slicer release that corresponds to a Slicer revision.
+    Downloads associated with nightly build happening between release A and B are
+    associated with post-A "release".
+    """
+    self._getReleaseNames()
+    try:
+      revision = int(revision)
+    except ValueError:
+      return 0  # unknown
+    import bisect
+    # Index of the last release at or before this revision
+    releaseIndex = bisect.bisect_right(self._releaseRevisions, revision) - 1
+    if releaseIndex < 0:
+      return 1  # legacy
+    if self._releaseRevisions[releaseIndex] == revision:
+      # Exact match to a release
+      return 2 + 2 * releaseIndex
+    return 3 + 2 * releaseIndex
 
   #---------------------------------------------------------------------------
   def getSlicerReleaseName(self, revision):
@@ -267,88 +466,112 @@ class ExtensionStatsLogic(ScriptedLoadableModuleLogic):
       Downloads associated with nightly build happening between release A and B are
       associated with post-A "release".
       """
-
-      try:
-          revision = int(revision)
-      except ValueError:
-          return self.unknownReleaseName
-
-      release = self.legacyReleaseName
-      for release_revisionDate in self.releases_revisionsDates:
-          if revision < int(release_revisionDate[1][0]):
-              break
-          if revision == int(release_revisionDate[1][0]):
-              # Exact match to a release
-              release = release_revisionDate[0]
-              break
-          release = self.postReleasePrefix + release_revisionDate[0]
-
-      return release
+      return self._getReleaseNames()[self.getSlicerReleaseId(revision)]
 
   #---------------------------------------------------------------------------
-  def getExtensionDownloadStats(self, extensionNames=None):
-      """Return download count for extensions in a map indexed by extensionName and release.
+  def getExtensionDownloadCounts(self, extensionNames=None, source=None):
+      """Return download counts for extensions in a map indexed by extensionName.
+      Each value is an ExtensionReleaseDownloads record, which stores the download count of each release
+      in an array indexed by release id (see getSlicerReleaseNames).
       :param extensionNames: list containing extension names to consider, of None then statistics will be provided for all.
+      :param source: name of the statistics source to consider (see getDownloadStatsSourceNames),
+        if None then statistics of all sources are merged.
       """
-
+      if isinstance(extensionNames, str):
+        extensionNames = [extensionNames]
+      if extensionNames:
+        extensionNames = set(extensionNames)
       extension_release_downloads = {}
 
+      if source is None or source == self.baselineSourceName:
+        self._addBaselineDownloadCounts(extension_release_downloads, extensionNames)
+
+      # Get current extension download stats from Extensions Server (Girder server)
+      if source != self.baselineSourceName:
+        if self.downloadstats is None:
+          self.fetchDownloadStats()
+        if source is None:
+          payload = self.downloadstats
+        elif source in self.downloadstatsBySource:
+          payload = self.downloadstatsBySource[source]
+        else:
+          raise ValueError("Invalid source: " + source)
+        self._addPayloadDownloadCounts(extension_release_downloads, payload, extensionNames)
+
+      return extension_release_downloads
+
+  def _addBaselineDownloadCounts(self, extension_release_downloads, extensionNames):
       # Read baseline extension downloads from CSV file (that are not available in the current server stats
       # because they were collected using the old Midas server)
       import csv
+      numberOfReleases = len(self._getReleaseNames())
       with open(self.baselineExtensionDownloadStatsFile, 'r') as csvfile:
           datareader = csv.reader(csvfile)
           rows = iter(datareader)
           columns = next(rows)
+          columnReleaseIds = [self._releaseIds.get(release, 0) for release in columns[1:]]
           for row in rows:
               extensionName = row[0]
               if extensionNames and (extensionName not in extensionNames):
                   # this extension is not in the requested list of extensions
                   continue
-              for release, downloadCount in zip(columns[1:], row[1:]):
+              for releaseId, downloadCount in zip(columnReleaseIds, row[1:]):
                   downloadCount = int(downloadCount)
                   if downloadCount == 0:
                       continue
                   if extensionName not in extension_release_downloads:
-                      extension_release_downloads[extensionName] = {}
-                  if release not in extension_release_downloads[extensionName]:
-                      extension_release_downloads[extensionName][release] = 0
-                  extension_release_downloads[extensionName][release] += downloadCount
-
-      # Get current extension download stats from Extensions Server (Girder server)
-      if self.downloadstats is None:
-        resp = requests.get(self.downloadstatsUrl)
-        self.downloadstats = resp.json()
-      for revision in self.downloadstats:
-          release = self.getSlicerReleaseName(revision)
-          if 'extensions' not in self.downloadstats[revision]:
+                      extension_release_downloads[extensionName] = ExtensionReleaseDownloads(extensionName, numberOfReleases)
+                  extension_release_downloads[extensionName].counts[releaseId] += downloadCount
+
+  def _addPayloadDownloadCounts(self, extension_release_downloads, payload, extensionNames):
+      numberOfReleases = len(self._getReleaseNames())
+      for revision in payload:
+          releaseId = self.getSlicerReleaseId(revision)
+          if 'extensions' not in payload[revision]:
             # no extensions downloaded for this release
             continue
-          for extensionName in self.downloadstats[revision]['extensions']:
+          revisionExtensions = payload[revision]['extensions']
+          for extensionName in revisionExtensions:
               if extensionNames and (extensionName not in extensionNames):
                   # this extension is not in the requested list of extensions
                   continue
               downloadCount = 0
-              try:
-                  downloadCount += self.downloadstats[revision]['extensions'][extensionName]['win']['amd64']
-              except:
-                  pass
-              try:
-                  downloadCount += self.downloadstats[revision]['extensions'][extensionName]['macosx']['amd64']
-              except:
-                  pass
-              try:
-                  downloadCount += self.downloadstats[revision]['extensions'][extensionName]['linux']['amd64']
-              except:
-                  pass
+              for platform in ['win', 'macosx', 'linux']:
+                  try:
+                      downloadCount += revisionExtensions[extensionName][platform]['amd64']
+                  except:
+                      pass
               if downloadCount == 0:
                 continue
               if extensionName not in extension_release_downloads:
-                extension_release_downloads[extensionName] = {}
-              if release not in extension_release_downloads[extensionName]:
-                extension_release_downloads[extensionName][release] = 0
-              extension_release_downloads[extensionName][release] += downloadCount
+                extension_release_downloads[extensionName] = ExtensionReleaseDownloads(extensionName, numberOfReleases)
+              extension_release_downloads[extensionName].counts[releaseId] += downloadCount
 
+  #---------------------------------------------------------------------------
+  def getExtensionDownloadCountsBySource(self, extensionNames=None):
+      """Return total download count of each extension from each statistics source,
+      in a map indexed by extensionName and source name.
+      """
+      if self.downloadstats is None:
+        self.fetchDownloadStats()
+      sourceNames = [self.baselineSourceName] + list(self.downloadstatsBySource.keys())
+      extension_source_downloads = {}
+      for sourceName in sourceNames:
+        for extensionName, releaseDownloads in self.getExtensionDownloadCounts(extensionNames, sourceName).items():
+          extension_source_downloads.setdefault(extensionName, {})[sourceName] = sum(releaseDownloads.counts)
+      return extension_source_downloads
+
+  #---------------------------------------------------------------------------
+  def getExtensionDownloadStats(self, extensionNames=None):
+      """Return download count for extensions in a map indexed by extensionName and release.
+      Only releases with non-zero download count are included.
+      :param extensionNames: list containing extension names to consider, of None then statistics will be provided for all.
+      """
+      releases = self._getReleaseNames()
+      extension_release_downloads = {}
+      for extensionName, releaseDownloads in self.getExtensionDownloadCounts(extensionNames).items():
+        extension_release_downloads[extensionName] = {
+          releases[releaseId]: downloadCount for releaseId, downloadCount in enumerate(releaseDownloads.counts) if downloadCount}
       return extension_release_downloads
 
   def getReleaseDate(self, release):
@@ -372,6 +595,7 @@ class ExtensionStatsLogic(ScriptedLoadableModuleLogic):
       else:
         # Release date is found, now get the next release date
         endDate = release_revisionDate[1][1]
+        break
     if not startDate:
       raise ValueError("Cannot determine release duration for release: " + release)
     if not endDate:
@@ -382,32 +606,143 @@ class ExtensionStatsLogic(ScriptedLoadableModuleLogic):
     endDate = time.strptime(endDate, "%Y-%m-%d")
     startDateSec = time.mktime(startDate)
     endDateSec = time.mktime(endDate)
-    return int((endDateSec - startDateSec) / (24 * 3600))
+    # round to ignore daylight saving time changes
+    return round((endDateSec - startDateSec) / (24 * 3600))
+
+  def _normalizeExtensionNames(self, extensionNames):
+    """Return extension names as a tuple without blank or duplicate names (None if all extensions are requested)"""
+    if not extensionNames:
+      return None
+    if isinstance(extensionNames, str):
+      extensionNames = [extensionNames]
+    normalizedNames = []
+    for extensionName in extensionNames:
+      extensionName = extensionName.strip()
+      if extensionName and extensionName not in normalizedNames:
+        normalizedNames.append(extensionName)
+    return tuple(normalizedNames) if normalizedNames else None
+
+  def getExtensionDownloadStatsAsColumns(self, extensionNames, mode=None):
+    """Return download statistics table content as (extension names, columns).
+    Each column is a (column name, values) pair, where values is an array.array.
+    Results are kept in a least-recently-used cache, which is invalidated when new
+    download stats are fetched. The returned values must not be modified.
+    See getExtensionDownloadStatsAsTable for the list of modes.
+    """
+    if mode is None:
+      mode = "total"
+    extensionNames = self._normalizeExtensionNames(extensionNames)
+    if self.downloadstats is None:
+      self.fetchDownloadStats()
+
+    cacheKey = (extensionNames, mode, self.downloadstatsVersion)
+    if cacheKey in self.statsTableCache:
+      self.statsTableCacheHits += 1
+      self.statsTableCache.move_to_end(cacheKey)
+      return self.statsTableCache[cacheKey]
+
+    self.statsTableCacheMisses += 1
+    result = self._computeExtensionDownloadStatsColumns(extensionNames, mode)
+    self.statsTableCache[cacheKey] = result
+    while len(self.statsTableCache) > self.statsTableCacheMaximumSize:
+      self.statsTableCache.popitem(last=False)
+    return result
 
-  def getExtensionDownloadStatsAsTable(self, statsTableNode, extensionNames, mode=None):
-      """mode:
-        - `total` (default)
-        - `daily`
+  #---------------------------------------------------------------------------
+  def getExtensionDownloadAnalysis(self, extensionNames=None, anomalyThreshold=3.5):
+      """Return release-over-release trend analysis of extension downloads, computed for all extensions at once.
+      Release and post-release downloads are merged (as in `daily` mode), releases are sorted by date.
+      Returns a dictionary with:
+      - `extensionNames`: row names, `releases`: column names
+      - `downloads`: download count matrix (extensions x releases)
+      - `daily`: estimated daily download count
+      - `share`: fraction of all downloads of the release
+      - `growth`: relative change of daily downloads compared to the previous release (NaN if no previous downloads)
+      - `rank`: rank of the extension by downloads in the release (1 = most downloaded, extensions with the same
+        download count share the same rank, NaN if the extension has no downloads in the release)
+      - `rankChange`: number of ranks gained since the previous release (NaN if the extension has no downloads
+        in the release or in the previous release)
+      - `anomaly`: +1 (spike) or -1 (collapse) if the change of daily downloads is an outlier among all extensions
+        (robust z-score of log change above anomalyThreshold), 0 otherwise
       """
-      # Initialize columns
-      if mode is None:
-        mode = "total"
+      import numpy as np
+
+      releaseNames = self._getReleaseNames()
+      releases = [release for release, revision_date in self.releases_revisionsDates]
+      releaseIds = np.array([self._releaseIds[release] for release in releases])
+      postReleaseIds = np.array([self._releaseIds[self.postReleasePrefix + release] for release in releases])
+      durationDays = np.maximum(np.array([self.getReleaseDurationDays(release) for release in releases], dtype=float), 1.0)
+
+      extension_release_downloads = self.getExtensionDownloadCounts(extensionNames)
+      if extensionNames:
+        extensionNames = [extensionName for extensionName in self._normalizeExtensionNames(extensionNames)
+          if extensionName in extension_release_downloads]
+      else:
+        extensionNames = list(extension_release_downloads.keys())
+
+      # Matrix of download counts for all releases (extensions x release ids)
+      counts = np.zeros((len(extensionNames), len(releaseNames)), dtype=np.int64)
+      for row, extensionName in enumerate(extensionNames):
+        counts[row] = np.frombuffer(extension_release_downloads[extensionName].counts, dtype=np.int64)
+      downloads = (counts[:, releaseIds] + counts[:, postReleaseIds]).astype(float)
+      daily = downloads / durationDays
+
+      releaseTotals = downloads.sum(axis=0)
+      share = np.divide(downloads, releaseTotals, out=np.zeros_like(downloads), where=releaseTotals > 0)
+
+      growth = np.full_like(daily, np.nan)
+      np.divide(daily[:, 1:] - daily[:, :-1], daily[:, :-1], out=growth[:, 1:], where=daily[:, :-1] > 0)
+
+      # Rank is 1 + number of extensions with more downloads (ties share the lowest rank)
+      rank = np.full(downloads.shape, np.nan)
+      sortedDownloads = np.sort(downloads, axis=0)
+      for column in range(downloads.shape[1]):
+        rank[:, column] = 1 + len(extensionNames) - np.searchsorted(sortedDownloads[:, column], downloads[:, column], side='right')
+      rank[downloads == 0] = np.nan
+      rankChange = np.full_like(rank, np.nan)
+      rankChange[:, 1:] = rank[:, :-1] - rank[:, 1:]
+
+      anomaly = np.zeros(downloads.shape, dtype=np.int64)
+      if len(extensionNames) > 0:
+        logChange = np.log1p(daily[:, 1:]) - np.log1p(daily[:, :-1])
+        median = np.median(logChange, axis=0)
+        medianAbsoluteDeviation = np.median(np.abs(logChange - median), axis=0)
+        zScore = np.divide(0.6745 * (logChange - median), medianAbsoluteDeviation,
+          out=np.zeros_like(logChange), where=medianAbsoluteDeviation > 0)
+        anomaly[:, 1:] = np.where(zScore > anomalyThreshold, 1, np.where(zScore < -anomalyThreshold, -1, 0))
+
+      return {
+        'extensionNames': extensionNames, 'releases': releases,
+        'downloads': downloads, 'daily': daily, 'share': share, 'growth': growth,
+        'rank': rank, 'rankChange': rankChange, 'anomaly': anomaly,
+        }
+
+  def _computeExtensionDownloadStatsColumns(self, extensionNames, mode):
+      if mode in self.analysisModes:
+        analysis = self.getExtensionDownloadAnalysis(extensionNames)
+        matrix = analysis[mode]
+        columns = []
+        for column, release in enumerate(analysis['releases']):
+          if matrix.dtype.kind == 'f':
+            values = array.array('d', matrix[:, column].astype('float64').tobytes())
+          else:
+            values = array.array('i', matrix[:, column].astype('int32').tobytes())
+          columns.append((self.getReleaseDate(release), values))
+        return analysis['extensionNames'], columns
 
-      extensionNamesColumn = vtk.vtkStringArray()
-      extensionNamesColumn.SetName("Extension")
+      # Initialize columns
 
-      releases = self.getSlicerReleaseNames()
-      releaseDurationDaysreleaseDurationDays = {}
-      releaseColumns = {}
+      releases = self._getReleaseNames()
+      releaseColumnNames = {}
+      releaseDurationDays = {}
       for release in releases:
         if mode == "total":
-          releaseColumns[release] = vtk.vtkIntArray()
           date = self.getReleaseDate(release)
           if date and not release.startswith(self.postReleasePrefix):
-            name = f"{release} ({self.getReleaseDate(release)})"
+            name = f"{release} ({date})"
           else:
             name = release
-          releaseColumns[release].SetName(name)
+          releaseColumnNames[release] = name
         elif mode == "daily":
           if release in [self.unknownReleaseName, self.legacyReleaseName]:
             # we don't have dates for these releases, so we ignore them
@@ -415,44 +750,294 @@ class ExtensionStatsLogic(ScriptedLoadableModuleLogic):
           if release.startswith(self.postReleasePrefix):
             # we merge release and post-release stats
             continue
-          releaseColumns[release] = vtk.vtkFloatArray()
-          releaseColumns[release].SetName(self.getReleaseDate(release))
+          releaseColumnNames[release] = self.getReleaseDate(release)
+          releaseDurationDays[release] = self.getReleaseDurationDays(release)
         else:
           raise ValueError("Invalid mode: " + mode)
+      releaseColumns = {release: array.array('i' if mode == "total" else 'd') for release in releaseColumnNames}
 
       # Fill columns
 
-      extension_release_downloads = self.getExtensionDownloadStats(extensionNames)
+      extension_release_downloads = self.getExtensionDownloadCounts(extensionNames)
       if not extensionNames:
         extensionNames = extension_release_downloads.keys()
+      releaseIds = self._releaseIds
 
+      rowNames = []
       for extensionName in extensionNames:
           if extensionName not in extension_release_downloads:
             continue
-          extensionNamesColumn.InsertNextValue(extensionName)
-          release_downloads = extension_release_downloads[extensionName]
+          rowNames.append(extensionName)
+          counts = extension_release_downloads[extensionName].counts
           if mode == "total":
             for release in releaseColumns:
-                releaseColumns[release].InsertNextValue(release_downloads[release] if (release in release_downloads) else 0)
+                releaseColumns[release].append(counts[releaseIds[release]])
           elif mode == "daily":
             for release in releaseColumns:
-                releaseDurationDay = self.getReleaseDurationDays(release)
-                dailyDownloadCount = 0
-                if release in release_downloads:
-                  dailyDownloadCount += release_downloads[release] / releaseDurationDay
-                if self.postReleasePrefix + release in release_downloads:
-                  dailyDownloadCount += release_downloads[self.postReleasePrefix + release] / releaseDurationDay
-                releaseColumns[release].InsertNextValue(dailyDownloadCount)
-          else:
-            raise ValueError("Invalid mode: " + mode)
+                # merge release and post-release downloads
+                downloadCount = counts[releaseIds[release]] + counts[releaseIds[self.postReleasePrefix + release]]
+                releaseColumns[release].append(downloadCount / releaseDurationDays[release])
 
-      # Add columns to table
+      return rowNames, [(releaseColumnNames[release], releaseColumns[release]) for release in releaseColumns]
 
-      statsTableNode.RemoveAllColumns()
-      statsTableNode.AddColumn(extensionNamesColumn)
-      for release in releaseColumns:
-        statsTableNode.AddColumn(releaseColumns[release])
-      statsTableNode.Modified()
+  def getExtensionDownloadStatsAsTable(self, statsTableNode, extensionNames, mode=None):
+      """mode:
+        - `total` (default)
+        - `daily`
+        - `share`, `growth`, `rank`, `rankChange`, `anomaly`: see getExtensionDownloadAnalysis
+      Returns True if the table content has changed.
+      """
+      rowNames, columns = self.getExtensionDownloadStatsAsColumns(extensionNames, mode)
+
+      # Update the table in place: columns that are already in the table (same name and type) are kept
+      # and only values that differ are set, so that the table view does not need a full rebuild.
+      # All changes are reported in a single Modified event (or none, if nothing has changed).
+      table = statsTableNode.GetTable()
+      wasModifying = statsTableNode.StartModify()
+      changed = False
+
+      expectedColumns = [("Extension", "vtkStringArray")]
+      for columnName, values in columns:
+        expectedColumns.append((columnName, "vtkIntArray" if values.typecode == 'i' else "vtkFloatArray"))
+
+      # Keep matching columns, remove the rest
+      numberOfKeptColumns = 0
+      for columnName, columnClassName in expectedColumns:
+        if numberOfKeptColumns >= table.GetNumberOfColumns():
+          break
+        column = table.GetColumn(numberOfKeptColumns)
+        if column.GetName() != columnName or column.GetClassName() != columnClassName:
+          break
+        numberOfKeptColumns += 1
+      while table.GetNumberOfColumns() > numberOfKeptColumns:
+        statsTableNode.RemoveColumn(table.GetNumberOfColumns() - 1)
+        changed = True
+
+      if table.GetNumberOfRows() != len(rowNames):
+        table.SetNumberOfRows(len(rowNames))
+        changed = True
+
+      # Update values of kept columns
+      columnValues = [rowNames] + [values for columnName, values in columns]
+      for columnIndex in range(numberOfKeptColumns):
+        column = table.GetColumn(columnIndex)
+        columnChanged = False
+        for rowIndex, value in enumerate(columnValues[columnIndex]):
+          if self._isTableValueChanged(column.GetValue(rowIndex), value):
+            column.SetValue(rowIndex, value)
+            columnChanged = True
+        if columnChanged:
+          column.Modified()
+          changed = True
+
+      # Add new columns
+      for columnIndex in range(numberOfKeptColumns, len(expectedColumns)):
+        columnName, columnClassName = expectedColumns[columnIndex]
+        values = columnValues[columnIndex]
+        column = getattr(vtk, columnClassName)()
+        column.SetName(columnName)
+        column.SetNumberOfValues(len(values))
+        for rowIndex, value in enumerate(values):
+          column.SetValue(rowIndex, value)
+        statsTableNode.AddColumn(column)
+        changed = True
+
+      if changed:
+        table.Modified()
+        statsTableNode.Modified()
+      statsTableNode.EndModify(wasModifying)
+      return changed
+
+  @staticmethod
+  def _isTableValueChanged(currentValue, value):
+    if currentValue == value:
+      return False
+    if isinstance(value, float):
+      if value != value or currentValue != currentValue:
+        # NaN
+        return (value != value) != (currentValue != currentValue)
+      # Float columns store values in single precision
+      return abs(currentValue - value) > 1e-6 * max(1.0, abs(value))
+    return True
+
+
+#
+# ExtensionStatsServer
+#
+
+class ExtensionStatsServer:
+  """Serves download statistics over HTTP, from statistics fetched and aggregated once
+  and refreshed periodically. Many consumers can query statistics without each of them
+  downloading the full payload.
+
+  Endpoints (GET):
+  - `/extensions`: list of extension names (JSON)
+  - `/releases`: list of release names (JSON)
+  - `/stats`: statistics table. Query parameters: `extensions` (comma-separated list, all extensions if not specified),
+    `mode` (table mode of ExtensionStatsLogic.getExtensionDownloadStatsAsTable, default `total`),
+    `release` (comma-separated list of releases to keep, all releases if not specified),
+    `format` (`json` (default) or `csv`).
+
+  Responses have an ETag header, requests with a matching If-None-Match header get a 304 (Not Modified) response.
+  """
+
+  def __init__(self, logic=None, host="127.0.0.1", port=8080, refreshIntervalSec=3600):
+    import threading
+    self.logic = logic if logic else ExtensionStatsLogic()
+    self.host = host
+    self.port = port
+    self.refreshIntervalSec = refreshIntervalSec
+    # ExtensionStatsLogic is not thread-safe, all accesses are serialized
+    self.lock = threading.Lock()
+    self.stopEvent = threading.Event()
+    self.httpServer = None
+    self.threads = []
+    # Serialized responses, indexed by (payload version, request)
+    self.responseCache = {}
+    self.responseCacheMaximumSize = 256
+
+  def start(self):
+    """Fetch statistics (if not fetched yet) and start serving requests in background threads"""
+    import http.server
+    import threading
+    with self.lock:
+      if self.logic.downloadstats is None:
+        self.logic.fetchDownloadStats()
+    server = self
+    class RequestHandler(http.server.BaseHTTPRequestHandler):
+      def do_GET(self):
+        server._handleRequest(self)
+      def log_message(self, format, *args):
+        logging.debug("ExtensionStatsServer: " + format, *args)
+    self.stopEvent.clear()
+    self.httpServer = http.server.ThreadingHTTPServer((self.host, self.port), RequestHandler)
+    self.port = self.httpServer.server_address[1]
+    self.threads = [threading.Thread(target=self.httpServer.serve_forever, daemon=True)]
+    if self.refreshIntervalSec:
+      self.threads.append(threading.Thread(target=self._refreshLoop, daemon=True))
+    for thread in self.threads:
+      thread.start()
+    logging.info(f"Extension statistics server started at http://{self.host}:{self.port}")
+
+  def stop(self):
+    self.stopEvent.set()
+    if self.httpServer:
+      self.httpServer.shutdown()
+      self.httpServer.server_close()
+      self.httpServer = None
+    for thread in self.threads:
+      thread.join()
+    self.threads = []
+
+  def refresh(self):
+    """Fetch statistics again. Previous statistics are kept if fetching fails."""
+    with self.lock:
+      sources = self.logic.getDownloadStatsSources()
+    try:
+      # Fetch outside of the lock, requests are served from previous statistics meanwhile
+      downloadstats, downloadstatsBySource = self.logic.fetchDownloadStatsFromSources(sources)
+    except Exception as e:
+      logging.error(f"Failed to refresh extension statistics: {e}")
+      return False
+    with self.lock:
+      self.logic.downloadstats = downloadstats
+      self.logic.downloadstatsBySource = downloadstatsBySource
+      self.responseCache.clear()
+    return True
+
+  def _refreshLoop(self):
+    while not self.stopEvent.wait(self.refreshIntervalSec):
+      self.refresh()
+
+  def _getResponse(self, path, query):
+    """Return (content type, body) for a request, raise KeyError if not found and ValueError if invalid"""
+    import json
+    if path == "/extensions":
+      return "application/json", json.dumps(sorted(self.logic.getExtensionNames()))
+    if path == "/releases":
+      return "application/json", json.dumps(self.logic.getSlicerReleaseNames())
+    if path != "/stats":
+      raise KeyError(path)
+
+    extensionNames = query.get("extensions", [None])[0]
+    extensionNames = extensionNames.split(",") if extensionNames else None
+    mode = query.get("mode", ["total"])[0]
+    releases = query.get("release", [None])[0]
+    outputFormat = query.get("format", ["json"])[0]
+    if outputFormat not in ["json", "csv"]:
+      raise ValueError("Invalid format: " + outputFormat)
+
+    rowNames, columns = self.logic.getExtensionDownloadStatsAsColumns(extensionNames, mode)
+    if releases:
+      releaseColumnNames = set()
+      for release in releases.split(","):
+        releaseColumnNames.add(release)
+        releaseDate = self.logic.getReleaseDate(release)
+        if releaseDate:
+          releaseColumnNames.add(releaseDate)
+          releaseColumnNames.add(f"{release} ({releaseDate})")
+      columns = [(columnName, values) for columnName, values in columns if columnName in releaseColumnNames]
+
+    if outputFormat == "json":
+      import math
+      stats = {}
+      for rowIndex, extensionName in enumerate(rowNames):
+        # NaN and infinity are not valid in JSON, they are written as null
+        stats[extensionName] = {columnName: (values[rowIndex] if math.isfinite(values[rowIndex]) else None)
+          for columnName, values in columns}
+      return "application/json", json.dumps({"mode": mode, "columns": [columnName for columnName, values in columns],
+        "extensions": stats}, allow_nan=False)
+    else:
+      import csv
+      import io
+      csvText = io.StringIO()
+      csvWriter = csv.writer(csvText, delimiter=',')
+      csvWriter.writerow(['Extension name'] + [columnName for columnName, values in columns])
+      for rowIndex, extensionName in enumerate(rowNames):
+        csvWriter.writerow([extensionName] + [values[rowIndex] for columnName, values in columns])
+      return "text/csv", csvText.getvalue()
+
+  def _handleRequest(self, handler):
+    import hashlib
+    import urllib.parse
+    url = urllib.parse.urlsplit(handler.path)
+    query = urllib.parse.parse_qs(url.query)
+    requestKey = (url.path, tuple(sorted((key, tuple(values)) for key, values in query.items())))
+    try:
+      with self.lock:
+        cacheKey = (self.logic.downloadstatsVersion, requestKey)
+        response = self.responseCache.get(cacheKey)
+        if response is None:
+          contentType, body = self._getResponse(url.path, query)
+          body = body.encode('utf-8')
+          response = (contentType, body, '"' + hashlib.sha1(body).hexdigest() + '"')
+          if len(self.responseCache) >= self.responseCacheMaximumSize:
+            self.responseCache.clear()
+          self.responseCache[cacheKey] = response
+    except KeyError:
+      handler.send_error(404)
+      return
+    except ValueError as e:
+      handler.send_error(400, str(e))
+      return
+    except Exception as e:
+      logging.error(f"Failed to process request {handler.path}: {e}")
+      handler.send_error(500)
+      return
+
+    contentType, body, etag = response
+    if etag in [tag.strip() for tag in handler.headers.get('If-None-Match', '').split(',')]:
+      handler.send_response(304)
+      handler.send_header('ETag', etag)
+      handler.end_headers()
+      return
+    handler.send_response(200)
+    handler.send_header('Content-Type', contentType + '; charset=utf-8')
+    handler.send_header('Content-Length', str(len(body)))
+    handler.send_header('ETag', etag)
+    handler.send_header('Cache-Control', 'no-cache')
+    handler.end_headers()
+    handler.wfile.write(body)
 
 
 class ExtensionStatsTest(ScriptedLoadableModuleTest):
@@ -472,6 +1057,13 @@ class ExtensionStatsTest(ScriptedLoadableModuleTest):
     """
     self.setUp()
     self.test_ExtensionStats1()
+    self.test_ExtensionStatsImportTime()
+    self.test_ExtensionStatsTableCache()
+    self.test_ExtensionStatsMemory()
+    self.test_ExtensionStatsMultipleSources()
+    self.test_ExtensionStatsAnalysis()
+    self.test_ExtensionStatsServer()
+    self.test_ExtensionStatsTableUpdate()
 
   def test_ExtensionStats1(self):
     self.delayDisplay("Starting the test")
@@ -484,6 +1076,345 @@ class ExtensionStatsTest(ScriptedLoadableModuleTest):
 
     self.delayDisplay('Test passed!')
 
+  def _importModuleInSeparateProcess(self, fileName, timeoutSec=300):
+    """Import a module source in a separate Slicer process.
+    Returns the import time and the list of Python modules that the import added to sys.modules.
+    """
+    import json
+    import subprocess
+    code = "\n".join([
+      "import json, sys, time",
+      "modulesBefore = set(sys.modules)",
+      "startTime = time.perf_counter()",
+      f"exec(compile(open({fileName!r}, 'rb').read(), {fileName!r}, 'exec'), {{'__name__': 'ImportedModule'}})",
+      "importTime = time.perf_counter() - startTime",
+      "print('ModuleImport=' + json.dumps({'importTime': importTime, 'importedModules': sorted(set(sys.modules) - modulesBefore)}))",
+      "sys.exit(0)"])
+    args = [slicer.app.applicationFilePath(), "--no-splash", "--no-main-window", "--disable-cli-modules",
+      "--disable-scripted-loadable-modules", "--python-code", code]
+    result = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, timeout=timeoutSec)
+    for line in result.stdout.splitlines():
+      if line.startswith('ModuleImport='):
+        return json.loads(line.split('=', 1)[1])
+    raise RuntimeError(f"Failed to import {fileName}:\n{result.stdout}")
+
+  def test_ExtensionStatsImportTime(self):
+    """Guard the module contribution to application startup time: loading the module
+    must not import heavy dependencies (such as requests). The module is imported in a separate process,
+    so that modules already imported in this application are detected too.
+    """
+    self.delayDisplay("Starting the test")
+
+    moduleImport = self._importModuleInSeparateProcess(slicer.modules.extensionstats.path)
+    logging.info(f"ExtensionStats module import time: {moduleImport['importTime'] * 1000.0:.1f} ms")
+    importedPackages = set(name.split('.')[0] for name in moduleImport['importedModules'])
+    for heavyModuleName in ['requests', 'numpy', 'http', 'concurrent']:
+      self.assertNotIn(heavyModuleName, importedPackages)
+
+    self.delayDisplay('Test passed!')
+
+  def test_ExtensionStatsTableCache(self):
+    self.delayDisplay("Starting the test")
+
+    logic = ExtensionStatsLogic()
+    logic.downloadstats = {
+      '29738': {'extensions': {'SlicerRT': {'win': {'amd64': 10}, 'linux': {'amd64': 5}}}},
+      '33241': {'extensions': {'SlicerRT': {'macosx': {'amd64': 7}}, 'SlicerIGT': {'win': {'amd64': 3}}}},
+      }
+    extensionNames, columns = logic.getExtensionDownloadStatsAsColumns(["SlicerRT", " SlicerRT", "SlicerIGT"])
+    self.assertEqual(extensionNames, ["SlicerRT", "SlicerIGT"])
+    self.assertEqual((logic.statsTableCacheHits, logic.statsTableCacheMisses), (0, 1))
+
+    # Same query with a differently written extension list is served from the cache
+    self.assertIs(logic.getExtensionDownloadStatsAsColumns("SlicerRT, SlicerIGT".split(','))[1], columns)
+    self.assertEqual((logic.statsTableCacheHits, logic.statsTableCacheMisses), (1, 1))
+
+    # Other mode is computed
+    logic.getExtensionDownloadStatsAsColumns(["SlicerRT", "SlicerIGT"], mode="daily")
+    self.assertEqual((logic.statsTableCacheHits, logic.statsTableCacheMisses), (1, 2))
+
+    # New payload invalidates the cache
+    logic.downloadstats = {'33241': {'extensions': {'SlicerIGT': {'win': {'amd64': 4}}}}}
+    self.assertEqual(len(logic.statsTableCache), 0)
+    extensionNames, columns = logic.getExtensionDownloadStatsAsColumns(["SlicerRT", "SlicerIGT"])
+    self.assertEqual((logic.statsTableCacheHits, logic.statsTableCacheMisses), (1, 3))
+    columnValues = dict((name, values) for name, values in columns)
+    self.assertEqual(columnValues["5.8.1 (2025-03-02)"][extensionNames.index("SlicerIGT")], 4)
+
+    self.delayDisplay('Test passed!')
+
+  def test_ExtensionStatsMemory(self):
+    """Compare memory footprint of per-extension download counts stored as dict of release names
+    (previous representation) and as ExtensionReleaseDownloads records, at full-catalog scale.
+    """
+    self.delayDisplay("Starting the test")
+
+    import tracemalloc
+    logic = ExtensionStatsLogic()
+    releases = logic.getSlicerReleaseNames()
+    numberOfExtensions = 2000
+
+    tracemalloc.start()
+    try:
+      startMemory = tracemalloc.get_traced_memory()[0]
+      # Release names used to be created by concatenation for each revision, create a new string for each key
+      releaseDownloadsDict = {}
+      for extensionIndex in range(numberOfExtensions):
+        releaseDownloadsDict[f"Extension{extensionIndex}"] = {
+          (release + " ")[:-1]: 1000 + extensionIndex + releaseIndex for releaseIndex, release in enumerate(releases)}
+      dictMemory = tracemalloc.get_traced_memory()[0] - startMemory
+      del releaseDownloadsDict
+
+      startMemory = tracemalloc.get_traced_memory()[0]
+      releaseDownloadsRecords = {}
+      for extensionIndex in range(numberOfExtensions):
+        record = ExtensionReleaseDownloads(f"Extension{extensionIndex}", len(releases))
+        for releaseIndex in range(len(releases)):
+          record.counts[releaseIndex] = 1000 + extensionIndex + releaseIndex
+        releaseDownloadsRecords[record.extensionName] = record
+      recordsMemory = tracemalloc.get_traced_memory()[0] - startMemory
+      del releaseDownloadsRecords
+    finally:
+      tracemalloc.stop()
+
+    logging.info(f"Download counts of {numberOfExtensions} extensions x {len(releases)} releases:"
+      f" dict: {dictMemory / 1e6:.1f} MB, records: {recordsMemory / 1e6:.1f} MB")
+    self.assertTrue(recordsMemory * 3 < dictMemory)
+
+    self.delayDisplay('Test passed!')
+
+  def test_ExtensionStatsMultipleSources(self):
+    """Fetch statistics from two local stand-in servers and check that they are fetched concurrently
+    and merged with source attribution.
+    """
+    self.delayDisplay("Starting the test")
+
+    import http.server
+    import json
+    import threading
+
+    responseDelaySec = 1.0
+    payloads = {
+      "public": {'33241': {'extensions': {'SlicerRT': {'win': {'amd64': 10}}, 'SlicerIGT': {'linux': {'amd64': 1}}}}},
+      "private": {'33241': {'extensions': {'SlicerRT': {'win': {'amd64': 5}, 'macosx': {'amd64': 2}}}},
+                  '33300': {'extensions': {'PrivateExtension': {'linux': {'amd64': 3}}}}},
+      }
+
+    class DownloadStatsHandler(http.server.BaseHTTPRequestHandler):
+      def do_GET(self):
+        time.sleep(responseDelaySec)
+        body = json.dumps(payloads[self.path.strip('/')]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+      def log_message(self, format, *args):
+        pass
+
+    servers = [http.server.ThreadingHTTPServer(('127.0.0.1', 0), DownloadStatsHandler) for sourceName in payloads]
+    for server in servers:
+      threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+      logic = ExtensionStatsLogic()
+      logic.downloadstatsSources = [(sourceName, f"http://127.0.0.1:{server.server_address[1]}/{sourceName}")
+        for sourceName, server in zip(payloads, servers)]
+      startTime = time.time()
+      logic.fetchDownloadStats()
+      fetchTime = time.time() - startTime
+    finally:
+      for server in servers:
+        server.shutdown()
+        server.server_close()
+
+    # Total latency is the latency of the slowest source
+    self.assertTrue(fetchTime < 1.8 * responseDelaySec)
+    self.assertEqual(logic.downloadstats['33241']['extensions']['SlicerRT'], {'win': {'amd64': 15}, 'macosx': {'amd64': 2}})
+
+    downloadCounts = logic.getExtensionDownloadCounts(["SlicerRT", "PrivateExtension"])
+    releaseId = logic.getSlicerReleaseNames().index("5.8.1")
+    self.assertEqual(downloadCounts["SlicerRT"].counts[releaseId], 17)
+    bySource = logic.getExtensionDownloadCountsBySource(["SlicerRT", "PrivateExtension"])
+    self.assertEqual(bySource["PrivateExtension"], {"private": 3})
+    self.assertEqual(bySource["SlicerRT"]["public"], 10)
+    self.assertEqual(bySource["SlicerRT"]["private"], 7)
+    self.assertTrue(bySource["SlicerRT"]["baseline"] > 0)
+
+    # Payloads of sources with the same name or the baseline name could not be told apart
+    logic.downloadstatsSources = [("public", "http://127.0.0.1/public"), ("public", "http://127.0.0.1/private")]
+    with self.assertRaises(ValueError):
+      logic.fetchDownloadStats()
+    logic.downloadstatsSources = [(logic.baselineSourceName, "http://127.0.0.1/public")]
+    with self.assertRaises(ValueError):
+      logic.fetchDownloadStats()
+
+    self.delayDisplay('Test passed!')
+
+  def test_ExtensionStatsAnalysis(self):
+    self.delayDisplay("Starting the test")
+
+    import numpy as np
+    logic = ExtensionStatsLogic()
+    # Use revisions after the baseline CSV to only have the downloads of this payload
+    revisions = {'5.4.0': '31938', '5.6.0': '32390', '5.6.1': '32438', '5.6.2': '32448'}
+    payload = {}
+    for extensionIndex in range(30):
+      for release, revision in revisions.items():
+        downloadCount = 100 + extensionIndex
+        if extensionIndex == 3 and release == '5.6.2':
+          downloadCount = 50000  # spike
+        if extensionIndex == 7 and release == '5.6.1':
+          downloadCount = 1  # collapse
+        payload.setdefault(revision, {'extensions': {}})['extensions'][f"TestExtension{extensionIndex:02d}"] = {'win': {'amd64': downloadCount}}
+    logic.downloadstats = payload
+    extensionNames = [f"TestExtension{extensionIndex:02d}" for extensionIndex in range(30)]
+
+    analysis = logic.getExtensionDownloadAnalysis(extensionNames)
+    self.assertEqual(analysis['extensionNames'], extensionNames)
+    column = analysis['releases'].index('5.6.2')
+    previousColumn = analysis['releases'].index('5.6.1')
+    self.assertAlmostEqual(analysis['share'][:, column].sum(), 1.0)
+    self.assertEqual(analysis['rank'][3, column], 1)
+    self.assertEqual(analysis['rankChange'][3, column], analysis['rank'][3, previousColumn] - 1)
+    self.assertTrue(analysis['growth'][3, column] > 100)
+    self.assertEqual(analysis['anomaly'][3, column], 1)
+    self.assertEqual(analysis['anomaly'][7, previousColumn], -1)
+    self.assertEqual(np.count_nonzero(analysis['anomaly'][:, column]), 2)  # spike of 3 and recovery of 7
+
+    # Extensions with the same download count share the same rank, extensions without downloads are not ranked
+    payload['32390']['extensions']["TestExtension01"] = {'win': {'amd64': 100}}  # same as TestExtension00
+    payload['32438']['extensions'].pop("TestExtension02")  # no downloads in 5.6.1
+    logic.downloadstats = payload
+    analysis = logic.getExtensionDownloadAnalysis(extensionNames)
+    column = analysis['releases'].index('5.6.0')
+    self.assertEqual(analysis['rank'][0, column], analysis['rank'][1, column])
+    self.assertEqual(analysis['rank'][2, column], analysis['rank'][1, column] - 1)
+    column = analysis['releases'].index('5.6.1')
+    self.assertTrue(np.isnan(analysis['rank'][2, column]))
+    self.assertTrue(np.isnan(analysis['rankChange'][2, column]))
+    self.assertTrue(np.isnan(analysis['rankChange'][2, column + 1]))
+    self.assertFalse(np.isnan(analysis['rankChange'][3, column]))
+
+    # Analysis modes are available as table columns
+    rowNames, columns = logic.getExtensionDownloadStatsAsColumns(extensionNames, mode="anomaly")
+    self.assertEqual(rowNames, extensionNames)
+    self.assertEqual(dict(columns)[logic.getReleaseDate('5.6.2')][3], 1)
+
+    # Release duration ends at the next release
+    self.assertEqual(logic.getReleaseDurationDays('5.6.2'), 294)
+    self.assertEqual(logic.getReleaseDurationDays('5.8.0'), 37)
+
+    # Same daily download count in all releases means no growth
+    payload = {}
+    for release, revision in revisions.items():
+      downloadCount = 10 * logic.getReleaseDurationDays(release)
+      payload.setdefault(revision, {'extensions': {}})['extensions']["TestExtension"] = {'win': {'amd64': downloadCount}}
+    logic.downloadstats = payload
+    analysis = logic.getExtensionDownloadAnalysis(["TestExtension"])
+    for release in ['5.6.0', '5.6.1', '5.6.2']:
+      self.assertAlmostEqual(analysis['growth'][0, analysis['releases'].index(release)], 0.0)
+
+    self.delayDisplay('Test passed!')
+
+  def test_ExtensionStatsServer(self):
+    self.delayDisplay("Starting the test")
+
+    import json
+    import urllib.error
+    import urllib.request
+
+    logic = ExtensionStatsLogic()
+    logic.downloadstats = {'33241': {'extensions': {'SlicerRT': {'win': {'amd64': 10}}, 'SlicerIGT': {'linux': {'amd64': 4}}}}}
+    server = ExtensionStatsServer(logic, port=0, refreshIntervalSec=None)
+    server.start()
+    try:
+      baseUrl = f"http://127.0.0.1:{server.port}"
+      with urllib.request.urlopen(baseUrl + "/stats?extensions=SlicerRT,SlicerIGT&release=5.8.1") as response:
+        etag = response.headers['ETag']
+        stats = json.loads(response.read())
+      self.assertEqual(stats['columns'], ["5.8.1 (2025-03-02)"])
+      self.assertEqual(stats['extensions']['SlicerIGT'], {"5.8.1 (2025-03-02)": 4})
+
+      # Unchanged statistics
+      request = urllib.request.Request(baseUrl + "/stats?release=5.8.1&extensions=SlicerRT,SlicerIGT", headers={'If-None-Match': etag})
+      with self.assertRaises(urllib.error.HTTPError) as cm:
+        urllib.request.urlopen(request)
+      self.assertEqual(cm.exception.code, 304)
+
+      # New statistics
+      logic.downloadstats = {'33241': {'extensions': {'SlicerIGT': {'linux': {'amd64': 5}}}}}
+      with urllib.request.urlopen(request) as response:
+        self.assertNotEqual(response.headers['ETag'], etag)
+        stats = json.loads(response.read())
+      self.assertEqual(stats['extensions']['SlicerIGT'], {"5.8.1 (2025-03-02)": 5})
+
+      with urllib.request.urlopen(baseUrl + "/stats?extensions=SlicerIGT&mode=daily&release=5.8.1&format=csv") as response:
+        self.assertEqual(response.read().decode().splitlines()[0], "Extension name,2025-03-02")
+
+      # Growth is undefined for the first release, it is written as null
+      logic.downloadstats = {
+        '33216': {'extensions': {'SlicerIGT': {'linux': {'amd64': 3}}}},
+        '33241': {'extensions': {'SlicerIGT': {'linux': {'amd64': 5}}}},
+        }
+      with urllib.request.urlopen(baseUrl + "/stats?extensions=SlicerIGT&mode=growth&release=5.8.0,5.8.1") as response:
+        stats = json.loads(response.read(), parse_constant=lambda constant: self.fail("Invalid JSON constant: " + constant))
+      growth = stats['extensions']['SlicerIGT']
+      self.assertIsNone(growth["2025-01-24"])
+      self.assertTrue(growth["2025-03-02"] is not None)
+
+      with self.assertRaises(urllib.error.HTTPError) as cm:
+        urllib.request.urlopen(baseUrl + "/stats?mode=invalid")
+      self.assertEqual(cm.exception.code, 400)
+    finally:
+      server.stop()
+
+    self.delayDisplay('Test passed!')
+
+  def test_ExtensionStatsTableUpdate(self):
+    self.delayDisplay("Starting the test")
+
+    logic = ExtensionStatsLogic()
+    logic.downloadstats = {'33241': {'extensions': {'SlicerRT': {'win': {'amd64': 10}}, 'SlicerIGT': {'linux': {'amd64': 4}}}}}
+    tableNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLTableNode")
+    modifiedEvents = []
+    tableNode.AddObserver(vtk.vtkCommand.ModifiedEvent, lambda caller, event: modifiedEvents.append(event))
+    try:
+      self.assertTrue(logic.getExtensionDownloadStatsAsTable(tableNode, ["SlicerRT", "SlicerIGT"]))
+      self.assertEqual(len(modifiedEvents), 1)
+      table = tableNode.GetTable()
+      releaseColumn = table.GetColumnByName("5.8.1 (2025-03-02)")
+      self.assertEqual(releaseColumn.GetValue(1), 4)
+
+      # Same content, table is not modified
+      self.assertFalse(logic.getExtensionDownloadStatsAsTable(tableNode, ["SlicerRT", "SlicerIGT"]))
+      self.assertEqual(len(modifiedEvents), 1)
+
+      # Changed value, columns are kept and only the value is updated
+      logic.downloadstats = {'33241': {'extensions': {'SlicerRT': {'win': {'amd64': 10}}, 'SlicerIGT': {'linux': {'amd64': 5}}}}}
+      numberOfColumns = table.GetNumberOfColumns()
+      self.assertTrue(logic.getExtensionDownloadStatsAsTable(tableNode, ["SlicerRT", "SlicerIGT"]))
+      self.assertEqual(len(modifiedEvents), 2)
+      self.assertEqual(table.GetNumberOfColumns(), numberOfColumns)
+      self.assertTrue(table.GetColumnByName("5.8.1 (2025-03-02)") is releaseColumn)
+      self.assertEqual(releaseColumn.GetValue(1), 5)
+
+      # Fewer rows
+      self.assertTrue(logic.getExtensionDownloadStatsAsTable(tableNode, ["SlicerIGT"]))
+      self.assertEqual(len(modifiedEvents), 3)
+      self.assertEqual(table.GetNumberOfRows(), 1)
+      self.assertEqual(releaseColumn.GetValue(0), 5)
+
+      # Different mode, columns are replaced
+      self.assertTrue(logic.getExtensionDownloadStatsAsTable(tableNode, ["SlicerRT", "SlicerIGT"], mode="daily"))
+      self.assertEqual(len(modifiedEvents), 4)
+      self.assertEqual(table.GetNumberOfRows(), 2)
+      self.assertEqual(table.GetColumn(0).GetValue(1), "SlicerIGT")
+      self.assertTrue(table.GetColumn(1).IsA("vtkFloatArray"))
+    finally:
+      slicer.mrmlScene.RemoveNode(tableNode)
+
+    self.delayDisplay('Test passed!')
+
 def main(argv):
   import argparse, json, csv
 
@@ -491,10 +1422,49 @@ def main(argv):
   parser.add_argument('-e', '--extensions', dest="extensionsList", required=False, help="Extension(s) to be queried. If more than one, separate by comma. If not specified, all extensions will be queried.")
   parser.add_argument('-j', '--output-json', dest="jsonName", required=False, help="Name of the output JSON file to store the results.")
   parser.add_argument('-s', '--output-csv', dest="csvName", required=False, help="Name of the output JSON file to store the results.")
+  parser.add_argument('-m', '--mode', dest="mode", default="total",
+    choices=["total", "daily", "share", "growth", "rank", "rankChange", "anomaly"],
+    help="Table mode of the statistics table written by --output-table-csv (default: total).")
+  parser.add_argument('-t', '--output-table-csv', dest="tableCsvName", required=False,
+    help="Name of the output CSV file to store the statistics table computed with the selected mode.")
+  parser.add_argument('--source', dest="sources", action='append', default=[], metavar="NAME=URL",
+    help="Additional extension server downloadstats URL to get statistics from. Can be specified multiple times.")
+  parser.add_argument('--no-default-source', dest="noDefaultSource", action='store_true',
+    help="Do not get statistics from the default extension server.")
+  parser.add_argument('--serve', dest="servePort", type=int, required=False, metavar="PORT",
+    help="Serve statistics over HTTP on the specified port (see ExtensionStatsServer for the available queries).")
+  parser.add_argument('--serve-host', dest="serveHost", default="127.0.0.1",
+    help="Address to serve statistics on (default: 127.0.0.1).")
+  parser.add_argument('--refresh-interval', dest="refreshIntervalSec", type=float, default=3600,
+    help="Interval in seconds between statistics refreshes when serving statistics (default: 3600).")
 
   args = parser.parse_args(argv)
 
   logic = ExtensionStatsLogic()
+  if args.sources or args.noDefaultSource:
+    sources = [] if args.noDefaultSource else logic.getDownloadStatsSources()
+    for source in args.sources:
+      if '=' not in source:
+        parser.error(f"Invalid source: {source} (expected NAME=URL)")
+      sources.append(tuple(source.split('=', 1)))
+    if not sources:
+      parser.error("No statistics source specified")
+    try:
+      logic.validateDownloadStatsSourceNames([name for name, url in sources])
+    except ValueError as e:
+      parser.error(str(e))
+    logic.downloadstatsSources = sources
+
+  if args.servePort is not None:
+    server = ExtensionStatsServer(logic, args.serveHost, args.servePort, args.refreshIntervalSec)
+    server.start()
+    print(f"Serving extension statistics at http://{args.serveHost}:{server.port} (press Ctrl+C to stop)")
+    try:
+      while True:
+        time.sleep(1)
+    except KeyboardInterrupt:
+      server.stop()
+    sys.exit(0)
 
   if args.extensionsList is None:
     extensionsList = logic.getExtensionNames()
@@ -529,6 +1499,13 @@ def main(argv):
             extensionStats = extensionStats+['0']
         csvWriter.writerow(extensionStats)
 
+  if args.tableCsvName:
+    rowNames, columns = logic.getExtensionDownloadStatsAsColumns(extensionsList, args.mode)
+    with open(args.tableCsvName, 'w', newline='') as csvFile:
+      csvWriter = csv.writer(csvFile, delimiter=',')
+      csvWriter.writerow(['Extension name'] + [columnName for columnName, values in columns])
+      for rowIndex, extensionName in enumerate(rowNames):
+        csvWriter.writerow([extensionName] + [values[rowIndex] for columnName, values in columns])
 
   sys.exit(0)
 